@@ -7,23 +7,48 @@ from confluent_kafka.schema_registry.protobuf import ProtobufDeserializer, Proto
 from confluent_kafka.serialization import MessageField, SerializationContext
 from google.protobuf.json_format import MessageToDict, ParseDict
 from piny import YamlLoader
-from fnmatch import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch, translate
+import copy
+import functools
 import glob
+import google.protobuf
+import hashlib
 import importlib
 import json
+import operator
 import os
 import re
 import requests
+import struct
 import sys
 import tempfile
 import time
 
+# Use the faster orjson for parsing and serializing JSON message payloads if it is installed (optional dependency). Serialized payloads are compact (no whitespace after separators) strings either way.
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(payload):
+        try:
+            return orjson.dumps(payload).decode("utf-8")
+        except TypeError:
+            # orjson only accepts str keys and a fixed set of types; leave everything else to the standard library.
+            return json.dumps(payload, separators=(",", ":"))
+except ImportError:
+    json_loads = json.loads
+    json_dumps = functools.partial(json.dumps, separators=(",", ":"))
+
 # Constants
 
 ALL_MESSAGES = -1
 RD_KAFKA_PARTITION_UA = -1
 CURRENT_TIME = 0
 
+# Schema ID in the Confluent wire format (big-endian unsigned 32-bit integer following the magic byte)
+schema_id_struct = struct.Struct(">I")
+
 # Helpers
 
 def is_interactive():
@@ -42,6 +67,30 @@ def create_unique_group_id():
     return str(get_millis())
 
 
+@functools.lru_cache(maxsize=64)
+def compile_pattern(pattern_str):
+    return re.compile(translate(pattern_str)).match
+
+
+def is_pattern(pattern_str):
+    return any(char_str in pattern_str for char_str in "*?[")
+
+
+def filter_str_list(str_collection, pattern_str_list):
+    # Literal names (i.e. without any glob metacharacters) are simply looked up; only real patterns are matched against all the strings (using regular expressions compiled only once per pattern).
+    literal_str_list = list(dict.fromkeys(pattern_str for pattern_str in pattern_str_list if not is_pattern(pattern_str)))
+    match_function_list = [compile_pattern(pattern_str) for pattern_str in pattern_str_list if is_pattern(pattern_str)]
+    if not match_function_list:
+        return [literal_str for literal_str in literal_str_list if literal_str in str_collection]
+    literal_str_set = set(literal_str_list)
+    return [element_str for element_str in str_collection if element_str in literal_str_set or any(match_function(element_str) for match_function in match_function_list)]
+
+
+def never_break(_):
+    # Default break function. The consume loop checks for it by identity to know that it can safely fetch the next batch of messages ahead of time.
+    return False
+
+
 def pretty(dict):
     return json.dumps(dict, indent=2)
 
@@ -50,7 +99,7 @@ def ppretty(dict):
     print(pretty(dict))
 
 
-def foldl_from_file(path_str, foldl_function, initial_acc, break_function=lambda _: False, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=4096, verbose=0, progress_num_lines=1000):
+def foldl_from_file(path_str, foldl_function, initial_acc, break_function=never_break, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=1048576, verbose=0, progress_num_lines=1000):
     """Read lines from a file and transform them in a foldl-like manner.
 
     Read lines/messages from a file and transform them in a foldl-like manner. Stops either if the file is read until the end or the number of lines/messages specified in ``n`` has been consumed.
@@ -59,11 +108,11 @@ def foldl_from_file(path_str, foldl_function, initial_acc, break_function=lambda
         path_str (:obj:`str`): The path to the local file to read from.
         foldl_function (:obj:`function`): Foldl function (takes an accumulator (any type) and a pair of strings (key and value) and returns the updated accumulator).
         initial_acc: Initial value of the accumulator (any type).
-        break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to lambda _: False, i.e., always continue reading.
+        break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to never_break, i.e., always continue reading.
         key_value_separator (:obj:`str`, optional): The separator between key and value. Defaults to None.
         message_separator (:obj:`str`, optional): The separator between individual lines/messages in the local file to read from. Defaults to the newline character.
         n (:obj:`int`, optional): The number of lines/messages to read from the local file. Defaults to ALL_MESSAGES = -1.
-        bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 4096.
+        bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 1048576 (1 MiB).
         verbose (:obj:`int`, optional): Verbosity level. Defaults to 0.
         progress_num_lines (:obj:`int`, optional): Number of lines/messages after which the progress in reading the file is displayed (if ``verbose`` > 0).
 
@@ -86,8 +135,6 @@ def foldl_from_file(path_str, foldl_function, initial_acc, break_function=lambda
     verbose_int = verbose
     progress_num_lines_int = progress_num_lines
     #
-    buf_str = ""
-    #
     line_counter_int = 0
     #
     def split(line_str):
@@ -96,7 +143,8 @@ def foldl_from_file(path_str, foldl_function, initial_acc, break_function=lambda
         #
         if line_str:
             if key_value_separator_str is not None:
-                split_str_list = line_str.split(key_value_separator_str)
+                # Only split at the first separator, i.e. values may contain the separator.
+                split_str_list = line_str.split(key_value_separator_str, 1)
                 if len(split_str_list) == 2:
                     key_str = split_str_list[0]
                     value_str = split_str_list[1]
@@ -108,51 +156,46 @@ def foldl_from_file(path_str, foldl_function, initial_acc, break_function=lambda
         return key_str, value_str
 
     #
-    acc = initial_acc
-    with open(path_str) as textIOWrapper:
-        break_bool = False
-        while True:
-            newbuf_str = textIOWrapper.read(bufsize_int)
-            if not newbuf_str:
-                if buf_str:
-                    last_line_str = buf_str
-                    line_counter_int += 1
-                    if verbose_int > 0 and line_counter_int % progress_num_lines_int == 0:
-                        print(f"Read: {line_counter_int}")
-                    #
-                    key_str_value_str_tuple = split(last_line_str)
-                    #
-                    if break_function(key_str_value_str_tuple):
-                        break_bool = True
-                        break
-                    #
-                    acc = foldl_function(acc, key_str_value_str_tuple)
-                break
-            buf_str += newbuf_str
-            line_str_list = buf_str.split(message_separator_str)
-            for line_str in line_str_list[:-1]:
-                line_counter_int += 1
-                if verbose_int > 0 and line_counter_int % progress_num_lines_int == 0:
-                    print(f"Read: {line_counter_int}")
-                #
-                key_str_value_str_tuple = split(line_str)
-                #
-                if break_function(key_str_value_str_tuple):
-                    break_bool = True
-                    break
-                #
-                acc = foldl_function(acc, key_str_value_str_tuple)
-                #
-                if (
-                    num_lines_int != ALL_MESSAGES
-                    and line_counter_int >= num_lines_int
-                ):
+    newline_bool = message_separator_str == "\n"
+    #
+    def line_generator(textIOWrapper_or_bufferedReader):
+        if newline_bool:
+            # Let the (C-level) line iterator of the text file object do the splitting.
+            for line_str in textIOWrapper_or_bufferedReader:
+                yield line_str.rstrip("\n")
+        else:
+            # Only keep the (small) incomplete last line of each chunk in the buffer, and only decode complete lines.
+            message_separator_bytes = message_separator_str.encode("utf-8")
+            buf_bytearray = bytearray()
+            while True:
+                newbuf_bytes = textIOWrapper_or_bufferedReader.read(bufsize_int)
+                if not newbuf_bytes:
+                    if buf_bytearray:
+                        yield buf_bytearray.decode("utf-8")
                     break
+                buf_bytearray += newbuf_bytes
+                line_bytearray_list = buf_bytearray.split(message_separator_bytes)
+                for line_bytearray in line_bytearray_list[:-1]:
+                    yield line_bytearray.decode("utf-8")
+                buf_bytearray = line_bytearray_list[-1]
+
+    #
+    acc = initial_acc
+    with open(path_str, "r" if newline_bool else "rb", buffering=bufsize_int, encoding="utf-8" if newline_bool else None) as textIOWrapper_or_bufferedReader:
+        for line_str in line_generator(textIOWrapper_or_bufferedReader):
+            line_counter_int += 1
+            if verbose_int > 0 and line_counter_int % progress_num_lines_int == 0:
+                print(f"Read: {line_counter_int}")
             #
-            if break_bool:
+            key_str_value_str_tuple = split(line_str)
+            #
+            if break_function(key_str_value_str_tuple):
                 break
             #
-            buf_str = line_str_list[-1]
+            acc = foldl_function(acc, key_str_value_str_tuple)
+            #
+            if num_lines_int != ALL_MESSAGES and line_counter_int >= num_lines_int:
+                break
     #
     return (acc, line_counter_int)
 
@@ -163,7 +206,13 @@ def get_config_dict(cluster_str):
     home_str = os.environ.get("KASHPY_HOME")
     if not home_str:
         home_str = "."
-    #
+    # Return a copy since the Cluster objects modify their configuration dictionaries.
+    return copy.deepcopy(load_config_dict(home_str, cluster_str))
+
+
+# Parsed cluster configuration files are cached; use load_config_dict.cache_clear() to re-read them after they have been changed.
+@functools.lru_cache(maxsize=32)
+def load_config_dict(home_str, cluster_str):
     cluster_path_str = f"{home_str}/clusters/{cluster_str}"
     if os.path.exists(f"{cluster_path_str}.yaml"):
         config_dict = YamlLoader(f"{cluster_path_str}.yaml").load()
@@ -242,15 +291,27 @@ def clusters(pattern="*", config=False):
 # Get AdminClient, Producer and Consumer objects from a configuration dictionary
 
 def get_adminClient(config_dict):
-    return AdminClient(config_dict)
+    # The AdminClient must never auto-create topics when requesting the metadata of single topics (e.g. in exists(), describe() or partitions()); librdkafka enables this by default for producer-type clients like the AdminClient.
+    return AdminClient({**config_dict, "allow.auto.create.topics": False})
+
+
+# Throughput-oriented producer defaults; settings from the "kafka" section of the cluster configuration take precedence. Durability (acks) is deliberately left to librdkafka's default (all), which is also required for enable.idempotence.
+producer_default_config_dict = {"linger.ms": 100, "batch.size": 131072, "compression.type": "lz4"}
 
 
 def get_producer(config_dict):
-    return Producer(config_dict)
+    return Producer({**producer_default_config_dict, **config_dict})
+
+
+# Throughput-oriented consumer defaults; settings from the "kafka" section of the cluster configuration take precedence.
+consumer_default_config_dict = {"fetch.min.bytes": 1048576, "fetch.wait.max.ms": 100, "queued.min.messages": 100000}
 
 
 def get_consumer(config_dict):
-    return Consumer(config_dict)
+    return Consumer({**consumer_default_config_dict, **config_dict})
+
+
+schema_registry_headers_dict = {"Accept": "application/vnd.schemaregistry.v1+json", "Content-Type": "application/vnd.schemaregistry.v1+json"}
 
 
 def get_schemaRegistryClient(config_dict):
@@ -260,21 +321,39 @@ def get_schemaRegistryClient(config_dict):
     return SchemaRegistryClient(dict)
 
 
+# Dynamically updatable broker configuration keys, cf. https://docs.confluent.io/platform/current/installation/configuration/broker-configs.html#cp-config-brokers
+broker_config_white_list_key_str_frozenset = frozenset({"advertised.listeners", "background.threads", "compression.type", "confluent.balancer.enable", "confluent.balancer.heal.uneven.load.trigger", "confluent.balancer.throttle.bytes.per.second", "confluent.tier.local.hotset.bytes", "confluent.tier.local.hotset.ms", "listeners", "log.flush.interval.messages", "log.flush.interval.ms", "log.retention.bytes", "log.retention.ms", "log.roll.jitter.ms", "log.roll.ms", "log.segment.bytes", "log.segment.delete.delay.ms", "message.max.bytes", "min.insync.replicas", "num.io.threads", "num.network.threads", "num.recovery.threads.per.data.dir", "num.replica.fetchers", "unclean.leader.election.enable", "confluent.balancer.exclude.topic.names", "confluent.balancer.exclude.topic.prefixes", "confluent.clm.enabled", "confluent.clm.frequency.in.hours", "confluent.clm.max.backup.days", "confluent.clm.min.delay.in.minutes", "confluent.clm.topic.retention.days.to.backup.days", "confluent.cluster.link.fetch.response.min.bytes", "confluent.cluster.link.fetch.response.total.bytes", "confluent.cluster.link.io.max.bytes.per.second", "confluent.tier.enable", "confluent.tier.max.partition.fetch.bytes.override", "log.cleaner.backoff.ms", "log.cleaner.dedupe.buffer.size", "log.cleaner.delete.retention.ms", "log.cleaner.io.buffer.load.factor", "log.cleaner.io.buffer.size", "log.cleaner.io.max.bytes.per.second", "log.cleaner.max.compaction.lag.ms", "log.cleaner.min.cleanable.ratio", "log.cleaner.min.compaction.lag.ms", "log.cleaner.threads", "log.cleanup.policy", "log.deletion.max.segments.per.run", "log.index.interval.bytes", "log.index.size.max.bytes", "log.message.timestamp.difference.max.ms", "log.message.timestamp.type", "log.preallocate", "max.connection.creation.rate", "max.connections", "max.connections.per.ip", "max.connections.per.ip.overrides", "principal.builder.class", "sasl.enabled.mechanisms", "sasl.jaas.config", "sasl.kerberos.kinit.cmd", "sasl.kerberos.min.time.before.relogin", "sasl.kerberos.principal.to.local.rules", "sasl.kerberos.service.name", "sasl.kerberos.ticket.renew.jitter", "sasl.kerberos.ticket.renew.window.factor", "sasl.login.refresh.buffer.seconds", "sasl.login.refresh.min.period.seconds", "sasl.login.refresh.window.factor", "sasl.login.refresh.window.jitter", "sasl.mechanism.inter.broker.protocol", "ssl.cipher.suites", "ssl.client.auth", "ssl.enabled.protocols", "ssl.keymanager.algorithm", "ssl.protocol", "ssl.provider", "ssl.trustmanager.algorithm", "confluent.cluster.link.replication.quota.mode", "confluent.metadata.server.cluster.registry.clusters", "confluent.reporters.telemetry.auto.enable", "confluent.security.event.router.config", "confluent.telemetry.enabled", "confluent.tier.topic.delete.backoff.ms", "confluent.tier.topic.delete.check.interval.ms", "confluent.tier.topic.delete.max.inprogress.partitions", "follower.replication.throttled.rate", "follower.replication.throttled.replicas", "leader.replication.throttled.rate", "leader.replication.throttled.replicas", "listener.security.protocol.map", "log.message.downconversion.enable", "metric.reporters", "ssl.endpoint.identification.algorithm", "ssl.engine.factory.class", "ssl.secure.random.implementation"})
+
 # Conversion functions from confluent_kafka objects to kash.py basic Python datatypes like strings and dictionaries
 
+def bytes_to_str(bytes):
+    return bytes.decode("utf-8") if bytes else bytes
+
+
+def bytes_to_bytes(bytes):
+    return bytes
+
+
+# Decode functions for the key/value types which do not need the Schema Registry (the others are bound per Cluster object, see Cluster.get_decode_function())
+type_str_decode_function_dict = {"str": bytes_to_str, "bytes": bytes_to_bytes, "json": json_loads}
+
+
+# Key/value types which are neither decoded nor serialized when replicated from one topic to another
+pass_through_type_str_list = ["bytes", "str"]
+
+
+def payload_to_str(payload):
+    # Keep the standard (human-readable) JSON formatting for files, e.g. for round trips of files through topics.
+    return json.dumps(payload) if isinstance(payload, dict) else str(payload)
+
+
+offset_int_str_dict = {OFFSET_BEGINNING: "OFFSET_BEGINNING", OFFSET_END: "OFFSET_END", OFFSET_INVALID: "OFFSET_INVALID", OFFSET_STORED: "OFFSET_STORED"}
+
+
 def offset_int_to_int_or_str(offset_int):
     if offset_int >= 0:
         return offset_int
-    if offset_int == OFFSET_BEGINNING:
-        return "OFFSET_BEGINNING"
-    elif offset_int == OFFSET_END:
-        return "OFFSET_END"
-    elif offset_int == OFFSET_INVALID:
-        return "OFFSET_INVALID"
-    elif offset_int == OFFSET_STORED:
-        return "OFFSET_STORED"
-    else:
-        return offset_int
+    return offset_int_str_dict.get(offset_int, offset_int)
 
 
 def groupMetadata_to_group_dict(groupMetadata):
@@ -325,140 +404,55 @@ def kafkaError_to_error_dict(kafkaError):
     )
 
 
+str_resourceType_dict = {"unknown": ResourceType.UNKNOWN, "any": ResourceType.ANY, "topic": ResourceType.TOPIC, "group": ResourceType.GROUP, "broker": ResourceType.BROKER}
+resourceType_str_dict = {resourceType: restype_str for restype_str, resourceType in str_resourceType_dict.items()}
+
+str_resourcePatternType_dict = {"unknown": ResourcePatternType.UNKNOWN, "any": ResourcePatternType.ANY, "match": ResourcePatternType.MATCH, "literal": ResourcePatternType.LITERAL, "prefixed": ResourcePatternType.PREFIXED}
+resourcePatternType_str_dict = {resourcePatternType: resource_pattern_type_str for resource_pattern_type_str, resourcePatternType in str_resourcePatternType_dict.items()}
+
+str_aclOperation_dict = {"unknown": AclOperation.UNKNOWN, "any": AclOperation.ANY, "all": AclOperation.ALL, "read": AclOperation.READ, "write": AclOperation.WRITE, "create": AclOperation.CREATE, "delete": AclOperation.DELETE, "alter": AclOperation.ALTER, "describe": AclOperation.DESCRIBE, "cluster_action": AclOperation.CLUSTER_ACTION, "describe_configs": AclOperation.DESCRIBE_CONFIGS, "alter_configs": AclOperation.ALTER_CONFIGS, "itempotent_write": AclOperation.IDEMPOTENT_WRITE}
+aclOperation_str_dict = {aclOperation: operation_str for operation_str, aclOperation in str_aclOperation_dict.items()}
+
+str_aclPermissionType_dict = {"unknown": AclPermissionType.UNKNOWN, "any": AclPermissionType.ANY, "deny": AclPermissionType.DENY, "allow": AclPermissionType.ALLOW}
+aclPermissionType_str_dict = {aclPermissionType: permission_type_str for permission_type_str, aclPermissionType in str_aclPermissionType_dict.items()}
+
+
+def lowercase_str_lookup(str_dict, key_str):
+    # The keys of the lookup tables are lowercase; only lowercase the key (i.e. allocate a new string) if it is not already found as it is.
+    value = str_dict.get(key_str)
+    return value if value is not None else str_dict.get(key_str.lower())
+
+
 def str_to_resourceType(restype_str):
-    restype_str1 = restype_str.lower()
-    if restype_str1 == "unknown":
-        return ResourceType.UNKNOWN
-    elif restype_str1 == "any":
-        return ResourceType.ANY
-    elif restype_str1 == "topic":
-        return ResourceType.TOPIC
-    elif restype_str1 == "group":
-        return ResourceType.GROUP
-    elif restype_str1 == "broker":
-        return ResourceType.BROKER
+    return lowercase_str_lookup(str_resourceType_dict, restype_str)
 
 
 def resourceType_to_str(resourceType):
-    if resourceType == ResourceType.UNKNOWN:
-        return "unknown"
-    elif resourceType == ResourceType.ANY:
-        return "any"
-    elif resourceType == ResourceType.TOPIC:
-        return "topic"
-    elif resourceType == ResourceType.GROUP:
-        return "group"
-    elif resourceType == ResourceType.BROKER:
-        return "broker"
+    return resourceType_str_dict.get(resourceType)
 
 
 def str_to_resourcePatternType(resource_pattern_type_str):
-    resource_pattern_type_str1 = resource_pattern_type_str.lower()
-    if resource_pattern_type_str1 == "unknown":
-        return ResourcePatternType.UNKNOWN
-    elif resource_pattern_type_str1 == "any":
-        return ResourcePatternType.ANY
-    elif resource_pattern_type_str1 == "match":
-        return ResourcePatternType.MATCH
-    elif resource_pattern_type_str1 == "literal":
-        return ResourcePatternType.LITERAL
-    elif resource_pattern_type_str1 == "prefixed":
-        return ResourcePatternType.PREFIXED
+    return lowercase_str_lookup(str_resourcePatternType_dict, resource_pattern_type_str)
 
 
 def resourcePatternType_to_str(resourcePatternType):
-    if resourcePatternType == ResourcePatternType.UNKNOWN:
-        return "unknown"
-    elif resourcePatternType == ResourcePatternType.ANY:
-        return "any"
-    elif resourcePatternType == ResourcePatternType.MATCH:
-        return "match"
-    elif resourcePatternType == ResourcePatternType.LITERAL:
-        return "literal"
-    elif resourcePatternType == ResourcePatternType.PREFIXED:
-        return "prefixed"
+    return resourcePatternType_str_dict.get(resourcePatternType)
 
 
 def str_to_aclOperation(operation_str):
-    operation_str1 = operation_str.lower()
-    if operation_str1 == "unknown":
-        return AclOperation.UNKNOWN
-    elif operation_str1 == "any":
-        return AclOperation.ANY
-    elif operation_str1 == "all":
-        return AclOperation.ALL
-    elif operation_str1 == "read":
-        return AclOperation.READ
-    elif operation_str1 == "write":
-        return AclOperation.WRITE
-    elif operation_str1 == "create":
-        return AclOperation.CREATE
-    elif operation_str1 == "delete":
-        return AclOperation.DELETE
-    elif operation_str1 == "alter":
-        return AclOperation.ALTER
-    elif operation_str1 == "describe":
-        return AclOperation.DESCRIBE
-    elif operation_str1 == "cluster_action":
-        return AclOperation.CLUSTER_ACTION
-    elif operation_str1 == "describe_configs":
-        return AclOperation.DESCRIBE_CONFIGS
-    elif operation_str1 == "alter_configs":
-        return AclOperation.ALTER_CONFIGS
-    elif operation_str1 == "itempotent_write":
-        return AclOperation.IDEMPOTENT_WRITE
+    return lowercase_str_lookup(str_aclOperation_dict, operation_str)
 
 
 def aclOperation_to_str(aclOperation):
-    if aclOperation == AclOperation.UNKNOWN:
-        return "unknown"
-    elif aclOperation == AclOperation.ANY:
-        return "any"
-    elif aclOperation == AclOperation.ALL:
-        return "all"
-    elif aclOperation == AclOperation.READ:
-        return "read"
-    elif aclOperation == AclOperation.WRITE:
-        return "write"
-    elif aclOperation == AclOperation.CREATE:
-        return "create"
-    elif aclOperation == AclOperation.DELETE:
-        return "delete"
-    elif aclOperation == AclOperation.ALTER:
-        return "alter"
-    elif aclOperation == AclOperation.DESCRIBE:
-        return "describe"
-    elif aclOperation == AclOperation.CLUSTER_ACTION:
-        return "cluster_action"
-    elif aclOperation == AclOperation.DESCRIBE_CONFIGS:
-        return "describe_configs"
-    elif aclOperation == AclOperation.ALTER_CONFIGS:
-        return "alter_configs"
-    elif aclOperation == AclOperation.IDEMPOTENT_WRITE:
-        return "itempotent_write"
+    return aclOperation_str_dict.get(aclOperation)
 
 
 def str_to_aclPermissionType(permission_type_str):
-    permission_type_str1 = permission_type_str.lower()
-    if permission_type_str1 == "unknown":
-        return AclPermissionType.UNKNOWN
-    elif permission_type_str1 == "any":
-        return AclPermissionType.ANY
-    elif permission_type_str1 == "deny":
-        return AclPermissionType.DENY
-    elif permission_type_str1 == "allow":
-        return AclPermissionType.ALLOW
+    return lowercase_str_lookup(str_aclPermissionType_dict, permission_type_str)
 
 
 def aclPermissionType_to_str(aclPermissionType):
-    if aclPermissionType == AclPermissionType.UNKNOWN:
-        return "unknown"
-    elif aclPermissionType == AclPermissionType.ANY:
-        return "any"
-    elif aclPermissionType == AclPermissionType.DENY:
-        return "deny"
-    elif aclPermissionType == AclPermissionType.ALLOW:
-        return "allow"
+    return aclPermissionType_str_dict.get(aclPermissionType)
 
 
 def aclBinding_to_dict(aclBinding):
@@ -487,38 +481,19 @@ def groupMember_to_dict(groupMember):
     }
 
 
+str_consumerGroupState_dict = {"unknown": _ConsumerGroupState.UNKOWN, "preparing_rebalancing": _ConsumerGroupState.PREPARING_REBALANCING, "completing_rebalancing": _ConsumerGroupState.COMPLETING_REBALANCING, "stable": _ConsumerGroupState.STABLE, "dead": _ConsumerGroupState.DEAD, "empty": _ConsumerGroupState.EMPTY}
+consumerGroupState_str_dict = {consumerGroupState: consumerGroupState_str for consumerGroupState_str, consumerGroupState in str_consumerGroupState_dict.items()}
+
+
 def consumerGroupState_to_str(consumerGroupState):
-    if consumerGroupState == _ConsumerGroupState.UNKOWN:
-        return "unknown"
-    elif consumerGroupState == _ConsumerGroupState.PREPARING_REBALANCING:
-        return "preparing_rebalancing"
-    elif consumerGroupState == _ConsumerGroupState.COMPLETING_REBALANCING:
-        return "completing_rebalancing"
-    elif consumerGroupState == _ConsumerGroupState.STABLE:
-        return "stable"
-    elif consumerGroupState == _ConsumerGroupState.DEAD:
-        return "dead"
-    elif consumerGroupState == _ConsumerGroupState.EMPTY:
-        return "empty"
+    return consumerGroupState_str_dict.get(consumerGroupState)
 
 
-all_consumerGroupState_str_list = ["unknown", "preparing_rebalancing", "completing_rebalancing", "stable", "dead", "empty"]
+all_consumerGroupState_str_list = list(str_consumerGroupState_dict.keys())
 
 
 def str_to_consumerGroupState(consumerGroupState_str):
-    if consumerGroupState_str == "unknown":
-        return _ConsumerGroupState.UNKOWN
-    elif consumerGroupState_str == "preparing_rebalancing":
-        return _ConsumerGroupState.PREPARING_REBALANCING 
-    elif consumerGroupState_str == "completing_rebalancing":
-        return _ConsumerGroupState.COMPLETING_REBALANCING
-    elif consumerGroupState_str == "stable":
-        return _ConsumerGroupState.STABLE
-    elif consumerGroupState_str == "dead":
-        return _ConsumerGroupState.DEAD
-    elif consumerGroupState_str == "empty":
-        return _ConsumerGroupState.EMPTY
-
+    return str_consumerGroupState_dict.get(consumerGroupState_str)
 
 def memberAssignment_to_dict(memberAssignment):
     return {
@@ -631,7 +606,7 @@ def group_offsets_to_consumerGroupTopicPartitions_list(group_offsets):
 
 # Cross-cluster
 
-def flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str, flatmap_function, break_function=lambda _: False, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=1):
+def flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str, flatmap_function, break_function=never_break, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=500):
     """Replicate a topic and transform the messages in a flatmap-like manner.
 
     Replicate (parts of) a topic (source_topic_str) on one cluster (source_cluster) to another topic (target_topic_str) on another (or the same) cluster (target_cluster). Each replicated message is transformed into a list of other messages in a flatmap-like manner. The source and target topics can have different message key and value types; e.g. the source topic can have value type Avro whereas the target topic will be written with value type Protobuf.
@@ -642,7 +617,7 @@ def flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str,
         target_cluster (:obj:`Cluster`): Target cluster
         target_topic_str (:obj:`str`): Target topic
         flatmap_function (:obj:`function`): Flatmap function (takes a message dictionary and returns a list of message dictionaries).
-        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
         group (:obj:`str`, optional): Consumer group name used for subscribing to the source topic. If set to None, creates a new unique consumer group name. Defaults to None.
         offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the source topic. If set to None, subscribe to the topic using the offsets from the consumer group for the topic. Defaults to None.
         config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the source topic. Defaults to {}.
@@ -655,7 +630,7 @@ def flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str,
         on_delivery (:obj:`function`, optional): Delivery report callback to call (from poll() or flush()) on successful or failed delivery. Passed on to confluent_kafka.Producer.produce(). Takes confluent_kafka.kafkaError and confluent_kafka.Message objects and returns nothing.
         keep_timestamps (:obj:`bool`, optional): Replicate the timestamps of the source messages in the target messages. Defaults to True.
         n (:obj:`int`, optional): Number of messages to consume from the source topic. Defaults to ALL_MESSAGES = -1.
-        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 1.
+        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 500.
 
     Returns:
         :obj:`tuple(int, int)`: Pair of the number of messages consumed from the source topic and the number of messages produced to the target topic.
@@ -693,39 +668,35 @@ def flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str,
     #
     target_cluster.produced_messages_counter_int = 0
     #
+    # Bind everything that does not change from message to message outside of the loop.
+    key_type_str = target_key_type_str or source_key_type_str
+    value_type_str = target_value_type_str or source_value_type_str
+    keep_partitions_bool = source_num_partitions_int == target_num_partitions_int
+    produce = target_cluster.produce
+    get_fields = operator.itemgetter("value", "key", "partition", "headers", "timestamp")
+    #
 
     def foreach_function(message_dict):
         message_dict_list = flatmap_function(message_dict)
         #
         for message_dict in message_dict_list:
-            if keep_timestamps_bool:
-                timestamp_int_int_tuple = message_dict["timestamp"]
-                if timestamp_int_int_tuple[0] == TIMESTAMP_CREATE_TIME:
-                    timestamp_int = timestamp_int_int_tuple[1]
-                else:
-                    timestamp_int = 0
-            else:
+            value, key, partition_int, headers, (timestamp_type_int, timestamp_int) = get_fields(message_dict)
+            #
+            if not keep_timestamps_bool or timestamp_type_int != TIMESTAMP_CREATE_TIME:
                 timestamp_int = 0
             #
-            key_type_str = target_key_type_str or source_key_type_str
-            value_type_str = target_value_type_str or source_value_type_str
-            key_schema_str = (
-                target_key_schema_str
-                or source_cluster.last_consumed_message_key_schema_str
-            )
-            value_schema_str = (
-                target_value_schema_str
-                or source_cluster.last_consumed_message_value_schema_str
-            )
-            partition_int = message_dict["partition"] if source_num_partitions_int == target_num_partitions_int else RD_KAFKA_PARTITION_UA
+            key_schema_str = target_key_schema_str or source_cluster.last_consumed_message_key_schema_str
+            value_schema_str = target_value_schema_str or source_cluster.last_consumed_message_value_schema_str
+            #
+            if not keep_partitions_bool:
+                partition_int = RD_KAFKA_PARTITION_UA
             #
-            target_cluster.produce(target_topic_str, message_dict["value"], message_dict["key"], key_type=key_type_str, value_type=value_type_str, key_schema=key_schema_str, value_schema=value_schema_str, partition=partition_int, timestamp=timestamp_int, headers=message_dict["headers"], on_delivery=on_delivery)
+            produce(target_topic_str, value, key, key_type=key_type_str, value_type=value_type_str, key_schema=key_schema_str, value_schema=value_schema_str, partition=partition_int, timestamp=timestamp_int, headers=headers, on_delivery=on_delivery)
             #
             if target_cluster.verbose_int > 0 and target_cluster.produced_messages_counter_int % target_cluster.kash_dict["progress.num.messages"] == 0:
                 print(f"Produced: {target_cluster.produced_messages_counter_int}")
             #
-            if target_cluster.produced_messages_counter_int % target_cluster.kash_dict["flush.num.messages"] == 0:
-                target_cluster.flush()
+            target_cluster.poll()
 
     #
     num_messages_int = source_cluster.foreach(source_topic_str, foreach_function, break_function=break_function, group=group, offsets=offsets, config=config, key_type=source_key_type_str, value_type=source_value_type_str, n=n, batch_size=batch_size)
@@ -735,7 +706,7 @@ def flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str,
     return (num_messages_int, target_cluster.produced_messages_counter_int)
 
 
-def filter(source_cluster, source_topic_str, target_cluster, target_topic_str, filter_function, break_function=lambda _: False, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=1):
+def filter(source_cluster, source_topic_str, target_cluster, target_topic_str, filter_function, break_function=never_break, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=500):
     """Replicate a topic and only keep those messages which fulfil a filter condition.
 
     Replicate (parts of) a topic (source_topic_str) on one cluster (source_cluster) to another topic (target_topic_str) on another (or the same) cluster (target_cluster) and only keep those messages fulfilling a filter condition. Each replicated message is transformed into a list of other messages in a flatmap-like manner. The source and target topics can have different message key and value types; e.g. the source topic can have value type Avro whereas the target topic will be written with value type Protobuf.
@@ -746,7 +717,7 @@ def filter(source_cluster, source_topic_str, target_cluster, target_topic_str, f
         target_cluster (:obj:`Cluster`): Target cluster
         target_topic_str (:obj:`str`): Target topic
         filter_function (:obj:`function`): Filter function (takes a message dictionary and returns True to keep the message and False to drop it).
-        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
         group (:obj:`str`, optional): Consumer group name used for subscribing to the source topic. If set to None, creates a new unique consumer group name. Defaults to None.
         offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the source topic. If set to None, subscribe to the topic using the offsets from the consumer group for the topic. Defaults to None.
         config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the source topic. Defaults to {}.
@@ -759,7 +730,7 @@ def filter(source_cluster, source_topic_str, target_cluster, target_topic_str, f
         on_delivery (:obj:`function`, optional): Delivery report callback to call (from poll() or flush()) on successful or failed delivery. Passed on to confluent_kafka.Producer.produce(). Takes confluent_kafka.kafkaError and confluent_kafka.Message objects and returns nothing.
         keep_timestamps (:obj:`bool`, optional): Replicate the timestamps of the source messages in the target messages. Defaults to True.
         n (:obj:`int`, optional): Number of messages to consume from the source topic. Defaults to ALL_MESSAGES = -1.
-        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 1.
+        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 500.
 
     Returns:
         :obj:`tuple(int, int)`: Pair of the number of messages consumed from the source topic and the number of messages produced to the target topic.
@@ -775,7 +746,7 @@ def filter(source_cluster, source_topic_str, target_cluster, target_topic_str, f
     return flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str, flatmap_function, break_function=break_function, group=group, offsets=offsets, config=config, source_key_type=source_key_type, source_value_type=source_value_type, target_key_type=target_key_type, target_value_type=target_value_type, target_key_schema=target_key_schema, target_value_schema=target_value_schema, on_delivery=on_delivery, keep_timestamps=keep_timestamps, n=n, batch_size=batch_size)
 
 
-def map(source_cluster, source_topic_str, target_cluster, target_topic_str, map_function, break_function=lambda _: False, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=1):
+def map(source_cluster, source_topic_str, target_cluster, target_topic_str, map_function, break_function=never_break, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=500):
     """Replicate a topic and optionally transform the messages in a map-like manner.
 
     Replicate (parts of) a topic (source_topic_str) on one cluster (source_cluster) to another topic (target_topic_str) on another (or the same) cluster (target_cluster). Each replicated message can be transformed into another messages in a map-like manner. The source and target topics can have different message key and value types; e.g. the source topic can have value type Avro whereas the target topic will be written with value type Protobuf. Stops either if the consume timeout is exceeded on the source cluster (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -786,7 +757,7 @@ def map(source_cluster, source_topic_str, target_cluster, target_topic_str, map_
         target_cluster (:obj:`Cluster`): Target cluster
         target_topic_str (:obj:`str`): Target topic
         map_function (:obj:`function`): Map function (takes a message dictionary and returns a message dictionary).
-        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
         group (:obj:`str`, optional): Consumer group name used for subscribing to the source topic. If set to None, creates a new unique consumer group name. Defaults to None.
         offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the source topic. If set to None, subscribe to the topic using the offsets from the consumer group for the topic. Defaults to None.
         config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the source topic. Defaults to {}.
@@ -799,7 +770,7 @@ def map(source_cluster, source_topic_str, target_cluster, target_topic_str, map_
         on_delivery (:obj:`function`, optional): Delivery report callback to call (from poll() or flush()) on successful or failed delivery. Passed on to confluent_kafka.Producer.produce(). Takes confluent_kafka.kafkaError and confluent_kafka.Message objects and returns nothing.
         keep_timestamps (:obj:`bool`, optional): Replicate the timestamps of the source messages in the target messages. Defaults to True.
         n (:obj:`int`, optional): Number of messages to consume from the source topic. Defaults to ALL_MESSAGES = -1.
-        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 1.
+        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 500.
 
     Returns:
         :obj:`tuple(int, int)`: Pair of the number of messages consumed from the source topic and the number of messages produced to the target topic.
@@ -815,7 +786,7 @@ def map(source_cluster, source_topic_str, target_cluster, target_topic_str, map_
     return flatmap(source_cluster, source_topic_str, target_cluster, target_topic_str, flatmap_function, break_function=break_function, group=group, offsets=offsets, config=config, source_key_type=source_key_type, source_value_type=source_value_type, target_key_type=target_key_type, target_value_type=target_value_type, target_key_schema=target_key_schema, target_value_schema=target_value_schema, on_delivery=on_delivery, keep_timestamps=keep_timestamps, n=n, batch_size=batch_size)
 
 
-def cp(source_cluster, source_topic_str, target_cluster, target_topic_str, flatmap_function=lambda x: [x], break_function=lambda _: False, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=1):
+def cp(source_cluster, source_topic_str, target_cluster, target_topic_str, flatmap_function=lambda x: [x], break_function=never_break, group=None, offsets=None, config={}, source_key_type="bytes", source_value_type="bytes", target_key_type=None, target_value_type=None, target_key_schema=None, target_value_schema=None, on_delivery=None, keep_timestamps=True, n=ALL_MESSAGES, batch_size=500):
     """Replicate a topic and optionally transform the messages in a flatmap-like manner.
 
     Replicate (parts of) a topic (source_topic_str) on one cluster (source_cluster) to another topic (target_topic_str) on another (or the same) cluster (target_cluster). Each replicated message can be transformed into a list of other messages in a flatmap-like manner. The source and target topics can have different message key and value types; e.g. the source topic can have value type Avro whereas the target topic will be written with value type Protobuf. Stops either if the consume timeout is exceeded on the source cluster (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -826,7 +797,7 @@ def cp(source_cluster, source_topic_str, target_cluster, target_topic_str, flatm
         target_cluster (:obj:`Cluster`): Target cluster
         target_topic_str (:obj:`str`): Target topic
         flatmap_function (:obj:`function`, optional): Flatmap function (takes a message dictionary and returns a list of message dictionaries). Defaults to lambda x: [x].
-        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+        break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the source topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
         group (:obj:`str`, optional): Consumer group name used for subscribing to the source topic. If set to None, creates a new unique consumer group name. Defaults to None.
         offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the source topic. If set to None, subscribe to the topic using the offsets from the consumer group for the topic. Defaults to None.
         config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the source topic. Defaults to {}.
@@ -839,7 +810,7 @@ def cp(source_cluster, source_topic_str, target_cluster, target_topic_str, flatm
         on_delivery (:obj:`function`, optional): Delivery report callback to call (from poll() or flush()) on successful or failed delivery. Passed on to confluent_kafka.Producer.produce(). Takes confluent_kafka.kafkaError and confluent_kafka.Message objects and returns nothing.
         keep_timestamps (:obj:`bool`, optional): Replicate the timestamps of the source messages in the target messages. Defaults to True.
         n (:obj:`int`, optional): Number of messages to consume from the source topic. Defaults to ALL_MESSAGES = -1.
-        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 1.
+        batch_size (:obj:`int`, optional): Maximum number of messages to consume from the source topic at a time. Defaults to 500.
 
     Returns:
         :obj:`tuple(int, int)`: Pair of the number of messages consumed from the source topic and the number of messages produced to the target topic.
@@ -902,7 +873,7 @@ def zip_foldl(cluster1, topic_str1, cluster2, topic_str2, zip_foldl_function, in
     batch_size_int = batch_size
     #
     if cluster1 == cluster2:
-        cluster2 = Cluster(cluster1.cluster_str)
+        cluster2 = Cluster(cluster1.cluster_str, producer_config=cluster1.producer_config_dict, consumer_config=cluster1.consumer_config_dict)
     #
     cluster1.subscribe(topic_str1, group=group1, offsets=offsets1, config=config1, key_type=key_type1, value_type=value_type1)
     cluster2.subscribe(topic_str2, group=group2, offsets=offsets2, config=config2, key_type=key_type2, value_type=value_type2)
@@ -1063,8 +1034,10 @@ class Cluster:
 
     * Producer (applies to all functions/methods producing messages to a cluster):
 
-      * ``flush.num.messages``: Number of messages produced before calling ``confluent_kafka.Producer.flush()``. Defaults to 10000.
-      * ``flush.timeout``: Timeout (in seconds) for calling ``confluent_kafka.Producer.flush()``. Defaults to -1 (no timeout).
+      * ``flush.num.messages``: Number of messages produced before serving delivery reports by calling ``confluent_kafka.Producer.poll(0)`` (non-blocking). Defaults to 10000.
+      * ``flush.num.bytes``: Number of bytes (keys and values) produced before serving delivery reports by calling ``confluent_kafka.Producer.poll(0)`` (non-blocking). Defaults to 16777216 (16 MiB).
+      * ``flush.interval``: Time (in seconds) after which delivery reports are served by calling ``confluent_kafka.Producer.poll(0)`` (non-blocking) at the latest while producing messages. Defaults to 5.0.
+      * ``flush.timeout``: Timeout (in seconds) for calling ``confluent_kafka.Producer.flush()`` (at the end of producing messages or when calling ``flush()``). Defaults to -1 (no timeout).
 
     * Consumer (applies to all functions/methods consuming messages from a cluster):
 
@@ -1072,6 +1045,7 @@ class Cluster:
       * ``auto.offset.reset``: Either "earliest" or "latest". Directly translates to the confluent_kafka/librdkafka consumer configuration. Defaults to "earliest".
       * ``enable.auto.commit``: Either "True" or "False". Directly translates to the confluent_kafka/librdkafka consumer configuration. Defaults to "True".
       * ``session.timeout.ms``: Timeout (in milliseconds) to detect client failures. Defaults to 45000.
+      * ``queued.max.messages.kbytes``: Maximum size (in kilobytes) of the messages prefetched per partition. Directly translates to the confluent_kafka/librdkafka consumer configuration. Raise it (e.g. to 16384) for throughput-bound consumption like downloading large topics, lower it (e.g. to 512) for interactive consumption with small batch sizes. Defaults to 4096.
 
     * Progress display:
 
@@ -1084,6 +1058,8 @@ class Cluster:
 
     Args:
         cluster_str (:obj:`str`): Name of the cluster; kash.py searches the folder "clusters" for kash.py configuration files named "<cluster_str>.yaml".
+        producer_config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the producer configuration (e.g. to set "linger.ms" or "batch.size" only for the producer of this Cluster object). Takes precedence over the "kafka" section of the configuration file. Defaults to None.
+        consumer_config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the configuration of the consumers created by ``subscribe()`` (e.g. to set "fetch.wait.max.ms" or "fetch.min.bytes" only for the consumers of this Cluster object). Takes precedence over the "kafka" and "kash" sections of the configuration file, but not over the ``config`` argument of ``subscribe()``. Defaults to None.
 
     Examples:
 
@@ -1110,12 +1086,15 @@ class Cluster:
 
             kash:
               flush.num.messages: 10000
+              flush.num.bytes: 16777216
+              flush.interval: 5.0
               flush.timeout: -1.0
               retention.ms: -1
               consume.timeout: 1.0
               auto.offset.reset: earliest
               enable.auto.commit: true
               session.timeout.ms: 10000
+              queued.max.messages.kbytes: 4096
               progress.num.messages: 1000
               block.num.retries.int: 50
               block.interval: 0.1
@@ -1136,12 +1115,15 @@ class Cluster:
 
             kash:
               flush.num.messages: 10000
+              flush.num.bytes: 16777216
+              flush.interval: 5.0
               flush.timeout: -1.0
               retention.ms: -1
               consume.timeout: 10.0
               auto.offset.reset: earliest
               enable.auto.commit: true
               session.timeout.ms: 10000
+              queued.max.messages.kbytes: 4096
               progress.num.messages: 1000
               block.num.retries.int: 50
               block.interval: 0.1
@@ -1157,17 +1139,20 @@ class Cluster:
 
             kash:
               flush.num.messages: 10000
+              flush.num.bytes: 16777216
+              flush.interval: 5.0
               flush.timeout: -1.0
               retention.ms: -1
               consume.timeout: 5.0
               auto.offset.reset: earliest
               enable.auto.commit: true
               session.timeout.ms: 10000
+              queued.max.messages.kbytes: 4096
               progress.num.messages: 1000
               block.num.retries.int: 50
               block.interval: 0.1
     """
-    def __init__(self, cluster_str):
+    def __init__(self, cluster_str, producer_config=None, consumer_config=None):
         self.cluster_str = cluster_str
         self.config_dict = get_config_dict(cluster_str)
         self.schema_registry_config_dict = self.config_dict["schema_registry"]
@@ -1176,26 +1161,58 @@ class Cluster:
         #
         self.adminClient = get_adminClient(self.config_dict)
         #
-        self.producer = get_producer(self.config_dict)
+        # Copies, i.e. neither shared with the caller nor with other Cluster objects (e.g. the second one created by zip_foldl()).
+        self.producer_config_dict = dict(producer_config or {})
+        self.producer = get_producer({**self.config_dict, **self.producer_config_dict})
+        #
+        self.consumer_config_dict = dict(consumer_config or {})
         #
         if self.schema_registry_config_dict:
             self.schemaRegistryClient = get_schemaRegistryClient(self.schema_registry_config_dict)
         else:
             self.schemaRegistryClient = None
+        # Keep the HTTP(S) connection(s) to the Schema Registry alive across requests.
+        self.schema_registry_session = requests.Session()
         #
         self.subscribed_topic_str = None
         self.subscribed_group_str = None
         self.subscribed_key_type_str = None
         self.subscribed_value_type_str = None
+        self.subscribed_message_to_message_dict = None
         self.last_consumed_message = None
         self.last_consumed_message_key_schema_str = None
         self.last_consumed_message_value_schema_str = None
+        self.last_consumed_message_key_schema_id_int = None
+        self.last_consumed_message_value_schema_id_int = None
         #
         self.schema_id_int_generalizedProtocolMessageType_protobuf_schema_str_tuple_dict = {}
         self.schema_id_int_avro_schema_str_dict = {}
         self.schema_id_int_jsonschema_str_dict = {}
+        self.schema_hash_str_generalizedProtocolMessageType_dict = {}
+        self.schema_str_topic_str_key_bool_tuple_generalizedProtocolMessageType_dict = {}
+        #
+        self.schema_id_int_protobufDeserializer_dict = {}
+        self.schema_id_int_avroDeserializer_dict = {}
+        self.schema_id_int_jsonDeserializer_dict = {}
+        #
+        self.serializer_key_tuple_generalizedProtocolMessageType_serializer_tuple_dict = {}
+        #
+        self.type_str_tuple_message_to_message_dict_function_dict = {}
+        #
+        self.topic_str_topicMetadata_dict = None
+        self.topic_str_topicMetadata_dict_timestamp_float = 0.0
+        #
+        # The consumer for looking up watermarks and offsets for timestamps never fetches any messages or commits any offsets, hence the small queue. Its configuration is derived once here, i.e. before subscribe() adds consumer group specific settings to self.config_dict.
+        self.dummy_consumer_config_dict = {**self.config_dict, "group.id": "dummy_group_id", "enable.auto.commit": False, "queued.max.messages.kbytes": 1024}
+        self.dummy_consumer = None
         #
         self.produced_messages_counter_int = 0
+        self.consumed_messages_counter_int = 0
+        self.unpolled_messages_counter_int = 0
+        self.unpolled_bytes_counter_int = 0
+        self.last_poll_timestamp_float = time.monotonic()
+        # Wait for the producer queue to drain below 90% of its capacity before producing more messages (instead of failing with BufferError). The capacity is taken from the same configuration the producer was created with. The watermark is at least 1, as poll() would block forever (even with an empty queue) with a watermark of 0.
+        self.producer_queue_high_watermark_int = max(1, int(0.9 * int({**self.config_dict, **self.producer_config_dict}.get("queue.buffering.max.messages", 100000))))
         #
         self.verbose_int = 1 if is_interactive() else 0
         #
@@ -1206,11 +1223,23 @@ class Cluster:
             self.retention_ms(604800000)
         else:
             self.retention_ms(int(self.kash_dict["retention.ms"]))
+        if "metadata.cache.ttl" not in self.kash_dict:
+            self.metadata_cache_ttl(0.0)
+        else:
+            self.metadata_cache_ttl(float(self.kash_dict["metadata.cache.ttl"]))
         # Producer
         if "flush.num.messages" not in self.kash_dict:
             self.flush_num_messages(10000)
         else:
             self.flush_num_messages(int(self.kash_dict["flush.num.messages"]))
+        if "flush.num.bytes" not in self.kash_dict:
+            self.flush_num_bytes(16777216)
+        else:
+            self.flush_num_bytes(int(self.kash_dict["flush.num.bytes"]))
+        if "flush.interval" not in self.kash_dict:
+            self.flush_interval(5.0)
+        else:
+            self.flush_interval(float(self.kash_dict["flush.interval"]))
         if "flush.timeout" not in self.kash_dict:
             self.flush_timeout(-1.0)
         else:
@@ -1233,6 +1262,10 @@ class Cluster:
             self.session_timeout_ms(45000)
         else:
             self.session_timeout_ms(int(self.kash_dict["session.timeout.ms"]))
+        if "queued.max.messages.kbytes" not in self.kash_dict:
+            self.queued_max_messages_kbytes(4096)
+        else:
+            self.queued_max_messages_kbytes(int(self.kash_dict["queued.max.messages.kbytes"]))
         # Standard output
         if "progress.num.messages" not in self.kash_dict:
             self.progress_num_messages(1000)
@@ -1263,6 +1296,19 @@ class Cluster:
             self.kash_dict["retention.ms"] = new_value_int
         return self.kash_dict["retention.ms"]
 
+    def metadata_cache_ttl(self, new_value_float=None):
+        """Get/set the metadata.cache.ttl kash setting (the number of seconds to cache the topic metadata of the cluster for; 0 = no caching).
+
+            Args:
+                new_value_float (:obj:`float`, optional): New value. Defaults to None (=just get, do not set).
+
+            Returns:
+                :obj:`float`: The metadata.cache.ttl kash setting.
+        """
+        if new_value_float is not None:
+            self.kash_dict["metadata.cache.ttl"] = new_value_float
+        return self.kash_dict["metadata.cache.ttl"]
+
     def flush_num_messages(self, new_value_int=None):
         """Get/set the flush.num.messages kash setting.
 
@@ -1276,6 +1322,32 @@ class Cluster:
             self.kash_dict["flush.num.messages"] = new_value_int
         return self.kash_dict["flush.num.messages"]
 
+    def flush_num_bytes(self, new_value_int=None):
+        """Get/set the flush.num.bytes kash setting.
+
+            Args:
+                new_value_int (:obj:`int`, optional): New value. Defaults to None (=just get, do not set).
+
+            Returns:
+                :obj:`int`: The flush.num.bytes kash setting.
+        """
+        if new_value_int is not None:
+            self.kash_dict["flush.num.bytes"] = new_value_int
+        return self.kash_dict["flush.num.bytes"]
+
+    def flush_interval(self, new_value_float=None):
+        """Get/set the flush.interval kash setting.
+
+            Args:
+                new_value_float (:obj:`float`, optional): New value. Defaults to None (=just get, do not set).
+
+            Returns:
+                :obj:`float`: The flush.interval kash setting.
+        """
+        if new_value_float is not None:
+            self.kash_dict["flush.interval"] = new_value_float
+        return self.kash_dict["flush.interval"]
+
     def flush_timeout(self, new_value_float=None):
         """Get/set the flush.timeout kash setting.
 
@@ -1341,6 +1413,19 @@ class Cluster:
             self.kash_dict["session.timeout.ms"] = new_value_int
         return self.kash_dict["session.timeout.ms"]
 
+    def queued_max_messages_kbytes(self, new_value_int=None):
+        """Get/set the queued.max.messages.kbytes kash setting.
+
+            Args:
+                new_value_int (:obj:`int`, optional): New value. Defaults to None (=just get, do not set).
+
+            Returns:
+                :obj:`int`: The queued.max.messages.kbytes kash setting.
+        """
+        if new_value_int is not None:
+            self.kash_dict["queued.max.messages.kbytes"] = new_value_int
+        return self.kash_dict["queued.max.messages.kbytes"]
+
     def progress_num_messages(self, new_value_int=None):
         """Get/set the progress.num.messages kash setting.
 
@@ -1402,22 +1487,29 @@ class Cluster:
         #
         schema_registry_url_str = self.schema_registry_config_dict["schema.registry.url"]
         url_str = f"{schema_registry_url_str}/subjects/{topic_str}-{key_or_value_str}/versions?normalize=true"
-        headers_dict = {"Accept": "application/vnd.schemaregistry.v1+json", "Content-Type": "application/vnd.schemaregistry.v1+json"}
         if "basic.auth.user.info" in self.schema_registry_config_dict:
             user_password_str = self.schema_registry_config_dict["basic.auth.user.info"]
             user_str_password_str_tuple = tuple(user_password_str.split(":"))
         else:
             user_str_password_str_tuple = None
         schema_dict = {"schema": schema_str, "schemaType": schema_type_str}
-        response = requests.post(url_str, headers=headers_dict, json=schema_dict, auth=user_str_password_str_tuple)
+        response = self.schema_registry_session.post(url_str, headers=schema_registry_headers_dict, json=schema_dict, auth=user_str_password_str_tuple)
         response_dict = response.json()
         return response_dict["id"]
 
     def schema_str_to_generalizedProtocolMessageType(self, schema_str, topic_str, key_bool):
+        # Register the schema for the subject and resolve the message type only once per schema, topic and key/value.
+        schema_str_topic_str_key_bool_tuple = (schema_str, topic_str, key_bool)
+        if schema_str_topic_str_key_bool_tuple in self.schema_str_topic_str_key_bool_tuple_generalizedProtocolMessageType_dict:
+            return self.schema_str_topic_str_key_bool_tuple_generalizedProtocolMessageType_dict[schema_str_topic_str_key_bool_tuple]
+        #
         schema_id_int = self.post_schema(schema_str, "PROTOBUF", topic_str, key_bool)
-        return self.schema_id_int_and_schema_str_to_generalizedProtocolMessageType(
+        generalizedProtocolMessageType = self.schema_id_int_and_schema_str_to_generalizedProtocolMessageType(
             schema_id_int, schema_str
         )
+        #
+        self.schema_str_topic_str_key_bool_tuple_generalizedProtocolMessageType_dict[schema_str_topic_str_key_bool_tuple] = generalizedProtocolMessageType
+        return generalizedProtocolMessageType
 
     def schema_id_int_to_generalizedProtocolMessageType_protobuf_schema_str_tuple(self, schema_id_int):
         schema = self.schemaRegistryClient.get_schema(schema_id_int)
@@ -1435,120 +1527,136 @@ class Cluster:
         return schema.schema_str
 
     def schema_id_int_and_schema_str_to_generalizedProtocolMessageType(self, schema_id_int, schema_str):
-        path_str = f"/{tempfile.gettempdir()}/kash.py/clusters/{self.cluster_str}"
-        os.makedirs(path_str, exist_ok=True)
-        file_str = f"schema_{schema_id_int}.proto"
-        file_path_str = f"{path_str}/{file_str}"
-        with open(file_path_str, "w") as textIOWrapper:
-            textIOWrapper.write(schema_str)
+        # Compiled schemas are cached by the hash of the schema string and the protobuf version (the generated code depends on it) - in memory, and on disk as generated modules (i.e., protoc is run only once for each distinct schema, even across processes).
+        schema_hash_str = hashlib.blake2b(f"{google.protobuf.__version__}/{schema_str}".encode("utf-8"), digest_size=16).hexdigest()
+        if schema_hash_str in self.schema_hash_str_generalizedProtocolMessageType_dict:
+            return self.schema_hash_str_generalizedProtocolMessageType_dict[schema_hash_str]
         #
-        import grpc_tools.protoc
-        grpc_tools.protoc.main(["protoc", f"-I{path_str}", f"--python_out={path_str}", f"{file_str}"])
+        path_str = os.path.join(tempfile.gettempdir(), "kash.py", "clusters", self.cluster_str)
+        os.makedirs(path_str, exist_ok=True)
+        module_str = f"schema_{schema_hash_str}_pb2"
+        module_path_str = os.path.join(path_str, f"{module_str}.py")
+        if not os.path.exists(module_path_str):
+            # Generate the module in a private directory and only then move it into place (atomically), so that concurrent processes never import a half-written module.
+            with tempfile.TemporaryDirectory(dir=path_str) as tmp_path_str:
+                file_str = f"schema_{schema_hash_str}.proto"
+                with open(os.path.join(tmp_path_str, file_str), "w") as textIOWrapper:
+                    textIOWrapper.write(schema_str)
+                #
+                import grpc_tools.protoc
+                if grpc_tools.protoc.main(["protoc", f"-I{tmp_path_str}", f"--python_out={tmp_path_str}", file_str]) != 0:
+                    raise Exception(f"Could not compile Protobuf schema: {schema_str}")
+                os.replace(os.path.join(tmp_path_str, f"{module_str}.py"), module_path_str)
+            importlib.invalidate_caches()
         #
-        sys.path.insert(1, path_str)
-        schema_module = importlib.import_module(f"schema_{schema_id_int}_pb2")
+        if path_str not in sys.path:
+            sys.path.insert(1, path_str)
+        schema_module = importlib.import_module(module_str)
         schema_name_str = list(schema_module.DESCRIPTOR.message_types_by_name.keys())[0]
-        return getattr(schema_module, schema_name_str)
+        generalizedProtocolMessageType = getattr(schema_module, schema_name_str)
+        #
+        self.schema_hash_str_generalizedProtocolMessageType_dict[schema_hash_str] = generalizedProtocolMessageType
+        return generalizedProtocolMessageType
 
     def bytes_protobuf_to_dict(self, bytes, key_bool):
-        schema_id_int = int.from_bytes(bytes[1:5], "big")
+        schema_id_int = schema_id_struct.unpack_from(bytes, 1)[0]
         if schema_id_int in self.schema_id_int_generalizedProtocolMessageType_protobuf_schema_str_tuple_dict:
             generalizedProtocolMessageType, protobuf_schema_str = self.schema_id_int_generalizedProtocolMessageType_protobuf_schema_str_tuple_dict[schema_id_int]
+            protobufDeserializer = self.schema_id_int_protobufDeserializer_dict[schema_id_int]
         else:
             generalizedProtocolMessageType, protobuf_schema_str = self.schema_id_int_to_generalizedProtocolMessageType_protobuf_schema_str_tuple(schema_id_int)
             self.schema_id_int_generalizedProtocolMessageType_protobuf_schema_str_tuple_dict[schema_id_int] = (generalizedProtocolMessageType, protobuf_schema_str)
+            # Construct the deserializer only once per schema ID and reuse it for all subsequent messages.
+            protobufDeserializer = ProtobufDeserializer(generalizedProtocolMessageType, {"use.deprecated.format": False})
+            self.schema_id_int_protobufDeserializer_dict[schema_id_int] = protobufDeserializer
         #
         if key_bool:
-            self.last_consumed_message_key_schema_str = protobuf_schema_str
-        else:
+            if schema_id_int != self.last_consumed_message_key_schema_id_int:
+                self.last_consumed_message_key_schema_id_int = schema_id_int
+                self.last_consumed_message_key_schema_str = protobuf_schema_str
+        elif schema_id_int != self.last_consumed_message_value_schema_id_int:
+            self.last_consumed_message_value_schema_id_int = schema_id_int
             self.last_consumed_message_value_schema_str = protobuf_schema_str
         #
-        protobufDeserializer = ProtobufDeserializer(generalizedProtocolMessageType, {"use.deprecated.format": False})
         protobuf_message = protobufDeserializer(bytes, None)
         return MessageToDict(protobuf_message)
 
     def bytes_avro_to_dict(self, bytes, key_bool):
-        schema_id_int = int.from_bytes(bytes[1:5], "big")
+        schema_id_int = schema_id_struct.unpack_from(bytes, 1)[0]
         if schema_id_int in self.schema_id_int_avro_schema_str_dict:
             avro_schema_str = self.schema_id_int_avro_schema_str_dict[schema_id_int]
+            avroDeserializer = self.schema_id_int_avroDeserializer_dict[schema_id_int]
         else:
             avro_schema_str = self.schema_id_int_to_avro_schema_str(schema_id_int)
             self.schema_id_int_avro_schema_str_dict[schema_id_int] = avro_schema_str
+            avroDeserializer = AvroDeserializer(self.schemaRegistryClient, avro_schema_str)
+            self.schema_id_int_avroDeserializer_dict[schema_id_int] = avroDeserializer
         #
         if key_bool:
-            self.last_consumed_message_key_schema_str = avro_schema_str
-        else:
+            if schema_id_int != self.last_consumed_message_key_schema_id_int:
+                self.last_consumed_message_key_schema_id_int = schema_id_int
+                self.last_consumed_message_key_schema_str = avro_schema_str
+        elif schema_id_int != self.last_consumed_message_value_schema_id_int:
+            self.last_consumed_message_value_schema_id_int = schema_id_int
             self.last_consumed_message_value_schema_str = avro_schema_str
         #
-        avroDeserializer = AvroDeserializer(self.schemaRegistryClient, avro_schema_str)
         return avroDeserializer(bytes, None)
 
     def bytes_jsonschema_to_dict(self, bytes, key_bool):
-        schema_id_int = int.from_bytes(bytes[1:5], "big")
+        schema_id_int = schema_id_struct.unpack_from(bytes, 1)[0]
         if schema_id_int in self.schema_id_int_jsonschema_str_dict:
             jsonschema_str = self.schema_id_int_jsonschema_str_dict[schema_id_int]
+            jsonDeserializer = self.schema_id_int_jsonDeserializer_dict[schema_id_int]
         else:
             jsonschema_str = self.schema_id_int_to_jsonschema_str(schema_id_int)
             self.schema_id_int_jsonschema_str_dict[schema_id_int] = jsonschema_str
+            jsonDeserializer = JSONDeserializer(jsonschema_str)
+            self.schema_id_int_jsonDeserializer_dict[schema_id_int] = jsonDeserializer
         #
         if key_bool:
-            self.last_consumed_message_key_schema_str = jsonschema_str
-        else:
+            if schema_id_int != self.last_consumed_message_key_schema_id_int:
+                self.last_consumed_message_key_schema_id_int = schema_id_int
+                self.last_consumed_message_key_schema_str = jsonschema_str
+        elif schema_id_int != self.last_consumed_message_value_schema_id_int:
+            self.last_consumed_message_value_schema_id_int = schema_id_int
             self.last_consumed_message_value_schema_str = jsonschema_str
         #
-        jsonDeserializer = JSONDeserializer(jsonschema_str)
         return jsonDeserializer(bytes, None)
 
     # Deserialize a message to a message dictionary
 
+    def get_decode_function(self, type_str, key_bool):
+        type_str1 = type_str.lower()
+        if type_str1 in type_str_decode_function_dict:
+            return type_str_decode_function_dict[type_str1]
+        elif type_str1 in ["pb", "protobuf"]:
+            return functools.partial(self.bytes_protobuf_to_dict, key_bool=key_bool)
+        elif type_str1 == "avro":
+            return functools.partial(self.bytes_avro_to_dict, key_bool=key_bool)
+        elif type_str1 == "jsonschema":
+            return functools.partial(self.bytes_jsonschema_to_dict, key_bool=key_bool)
+        else:
+            return bytes_to_bytes
+
     def message_to_message_dict(self, message, key_type="str", value_type="str"):
-        key_type_str = key_type
-        value_type_str = value_type
+        return self.get_message_to_message_dict_function(key_type, value_type)(message)
+
+    def get_message_to_message_dict_function(self, key_type, value_type):
+        # Build the message conversion function specialized to a pair of key and value types only once and reuse it afterwards.
+        type_str_tuple = (key_type.lower(), value_type.lower())
+        if type_str_tuple in self.type_str_tuple_message_to_message_dict_function_dict:
+            return self.type_str_tuple_message_to_message_dict_function_dict[type_str_tuple]
+        #
+        decode_key = self.get_decode_function(key_type, key_bool=True)
+        decode_value = self.get_decode_function(value_type, key_bool=False)
         #
 
-        def bytes_to_str(bytes):
-            return bytes.decode("utf-8") if bytes else bytes
-
-        #
-
-        def bytes_to_bytes(bytes):
-            return bytes
-
-        #
-        if key_type_str.lower() == "str":
-            decode_key = bytes_to_str
-        elif key_type_str.lower() == "bytes":
-            decode_key = bytes_to_bytes
-        elif key_type_str.lower() == "json":
-            decode_key = json.loads
-        elif key_type_str.lower() in ["pb", "protobuf"]:
-            def decode_key(bytes):
-                return self.bytes_protobuf_to_dict(bytes, key_bool=True)
-        elif key_type_str.lower() == "avro":
-            def decode_key(bytes):
-                return self.bytes_avro_to_dict(bytes, key_bool=True)
-        elif key_type_str.lower() == "jsonschema":
-            def decode_key(bytes):
-                return self.bytes_jsonschema_to_dict(bytes, key_bool=True)
-        #
-        if value_type_str.lower() == "str":
-            decode_value = bytes_to_str
-        elif value_type_str.lower() == "bytes":
-            decode_value = bytes_to_bytes
-        elif value_type_str.lower() == "json":
-            decode_value = json.loads
-        elif value_type_str.lower() in ["pb", "protobuf"]:
-            def decode_value(bytes):
-                return self.bytes_protobuf_to_dict(bytes, key_bool=False)
-        elif value_type_str.lower() == "avro":
-            def decode_value(bytes):
-                return self.bytes_avro_to_dict(bytes, key_bool=False)
-        elif value_type_str.lower() == "jsonschema":
-            def decode_value(bytes):
-                return self.bytes_jsonschema_to_dict(bytes, key_bool=False)
-        #
-        message_dict = {"headers": message.headers(), "partition": message.partition(), "offset": message.offset(), "timestamp": message.timestamp(), "key": decode_key(message.key()), "value": decode_value(message.value())}
-        return message_dict
+        def message_to_message_dict(message):
+            return {"headers": message.headers(), "partition": message.partition(), "offset": message.offset(), "timestamp": message.timestamp(), "key": decode_key(message.key()), "value": decode_value(message.value())}
+
+        #
+        self.type_str_tuple_message_to_message_dict_function_dict[type_str_tuple] = message_to_message_dict
+        return message_to_message_dict
 
     # Configuration helpers
 
@@ -1566,15 +1674,11 @@ class Cluster:
         #
         old_config_dict = self.get_config_dict(resourceType, resource_str)
         #
-        if resourceType == ResourceType.BROKER:
-            # https://docs.confluent.io/platform/current/installation/configuration/broker-configs.html#cp-config-brokers
-            white_list_key_str_list = ["advertised.listeners", "background.threads", "compression.type", "confluent.balancer.enable", "confluent.balancer.heal.uneven.load.trigger", "confluent.balancer.throttle.bytes.per.second", "confluent.tier.local.hotset.bytes", "confluent.tier.local.hotset.ms", "listeners", "log.flush.interval.messages", "log.flush.interval.ms", "log.retention.bytes", "log.retention.ms", "log.roll.jitter.ms", "log.roll.ms", "log.segment.bytes", "log.segment.delete.delay.ms", "message.max.bytes", "min.insync.replicas", "num.io.threads", "num.network.threads", "num.recovery.threads.per.data.dir", "num.replica.fetchers", "unclean.leader.election.enable", "confluent.balancer.exclude.topic.names", "confluent.balancer.exclude.topic.prefixes", "confluent.clm.enabled", "confluent.clm.frequency.in.hours", "confluent.clm.max.backup.days", "confluent.clm.min.delay.in.minutes", "confluent.clm.topic.retention.days.to.backup.days", "confluent.cluster.link.fetch.response.min.bytes", "confluent.cluster.link.fetch.response.total.bytes", "confluent.cluster.link.io.max.bytes.per.second", "confluent.tier.enable", "confluent.tier.max.partition.fetch.bytes.override", "log.cleaner.backoff.ms", "log.cleaner.dedupe.buffer.size", "log.cleaner.delete.retention.ms", "log.cleaner.io.buffer.load.factor", "log.cleaner.io.buffer.size", "log.cleaner.io.max.bytes.per.second", "log.cleaner.max.compaction.lag.ms", "log.cleaner.min.cleanable.ratio", "log.cleaner.min.compaction.lag.ms", "log.cleaner.threads", "log.cleanup.policy", "log.deletion.max.segments.per.run", "log.index.interval.bytes", "log.index.size.max.bytes", "log.message.timestamp.difference.max.ms", "log.message.timestamp.type", "log.preallocate", "max.connection.creation.rate", "max.connections", "max.connections.per.ip", "max.connections.per.ip.overrides", "principal.builder.class", "sasl.enabled.mechanisms", "sasl.jaas.config", "sasl.kerberos.kinit.cmd", "sasl.kerberos.min.time.before.relogin", "sasl.kerberos.principal.to.local.rules", "sasl.kerberos.service.name", "sasl.kerberos.ticket.renew.jitter", "sasl.kerberos.ticket.renew.window.factor", "sasl.login.refresh.buffer.seconds", "sasl.login.refresh.min.period.seconds", "sasl.login.refresh.window.factor", "sasl.login.refresh.window.jitter", "sasl.mechanism.inter.broker.protocol", "ssl.cipher.suites", "ssl.client.auth", "ssl.enabled.protocols", "ssl.keymanager.algorithm", "ssl.protocol", "ssl.provider", "ssl.trustmanager.algorithm", "confluent.cluster.link.replication.quota.mode", "confluent.metadata.server.cluster.registry.clusters", "confluent.reporters.telemetry.auto.enable", "confluent.security.event.router.config", "confluent.telemetry.enabled", "confluent.tier.topic.delete.backoff.ms", "confluent.tier.topic.delete.check.interval.ms", "confluent.tier.topic.delete.max.inprogress.partitions", "follower.replication.throttled.rate", "follower.replication.throttled.replicas", "leader.replication.throttled.rate", "leader.replication.throttled.replicas", "listener.security.protocol.map", "log.message.downconversion.enable", "metric.reporters", "ssl.endpoint.identification.algorithm", "ssl.engine.factory.class", "ssl.secure.random.implementation"]
-        #
         alter_config_dict = {}
         for key_str, value_str in old_config_dict.items():
             if (
                 resourceType == ResourceType.BROKER
-                and key_str not in white_list_key_str_list
+                and key_str not in broker_config_white_list_key_str_frozenset
             ):
                 continue
             if key_str in new_config_dict:
@@ -1590,6 +1694,43 @@ class Cluster:
 
     # AdminClient - topics
 
+    def get_dummy_consumer(self):
+        # Consumer for looking up watermarks and offsets for timestamps; created once and kept (to avoid re-connecting, re-authenticating etc. on every call).
+        if self.dummy_consumer is None:
+            self.dummy_consumer = get_consumer(self.dummy_consumer_config_dict)
+        return self.dummy_consumer
+
+    def close_dummy_consumer(self):
+        """Close the consumer used internally for looking up watermarks and offsets for timestamps.
+
+        Close the consumer used internally by watermarks(), size() and offsets_for_times(). It is transparently re-created on the next call of one of these methods.
+        """
+        if self.dummy_consumer is not None:
+            self.dummy_consumer.close()
+            self.dummy_consumer = None
+
+    def topic_metadata_cache_is_valid(self):
+        return self.topic_str_topicMetadata_dict is not None and time.monotonic() - self.topic_str_topicMetadata_dict_timestamp_float < self.kash_dict["metadata.cache.ttl"]
+
+    def get_topic_str_topicMetadata_dict(self):
+        # Topic metadata is cached for metadata.cache.ttl seconds (and invalidated by create(), delete() and set_partitions()) so that e.g. repeated calls of ls() or size() do not issue a metadata request each. The cache is disabled by default (metadata.cache.ttl = 0), as it can make ls() and exists() miss changes made by other clients.
+        if not self.topic_metadata_cache_is_valid():
+            self.topic_str_topicMetadata_dict = self.adminClient.list_topics().topics
+            self.topic_str_topicMetadata_dict_timestamp_float = time.monotonic()
+        return self.topic_str_topicMetadata_dict
+
+    def get_topic_str_topicMetadata_dict_for_patterns(self, pattern_str_list):
+        # For literal topic names only (i.e. without any glob metacharacters), request the metadata of just these topics instead of the metadata of all the topics on the cluster (unless the latter is cached anyway).
+        if self.topic_metadata_cache_is_valid() or any(is_pattern(pattern_str) for pattern_str in pattern_str_list):
+            return self.get_topic_str_topicMetadata_dict()
+        #
+        topic_str_topicMetadata_dict = {}
+        for topic_str in dict.fromkeys(pattern_str_list):
+            topicMetadata = self.adminClient.list_topics(topic=topic_str).topics.get(topic_str)
+            if topicMetadata is not None and topicMetadata.error is None:
+                topic_str_topicMetadata_dict[topic_str] = topicMetadata
+        return topic_str_topicMetadata_dict
+
     def size(self, pattern_str_or_str_list, timeout=-1.0):
         """List topics, their total sizes and the sizes of their partitions.
 
@@ -1647,16 +1788,29 @@ class Cluster:
         """
         timeout_float = timeout
         #
-        config_dict = self.config_dict
-        config_dict["group.id"] = "dummy_group_id"
-        consumer = get_consumer(config_dict)
+        consumer = self.get_dummy_consumer()
         #
-        topic_str_list = self.topics(pattern_str_or_str_list)
-        topic_str_partition_int_offsets_tuple_dict_dict = {}
-        for topic_str in topic_str_list:
-            partitions_int = self.partitions(topic_str)[topic_str]
-            partition_int_offsets_tuple_dict = {partition_int: consumer.get_watermark_offsets(TopicPartition(topic_str, partition=partition_int), timeout_float) for partition_int in range(partitions_int)}
-            topic_str_partition_int_offsets_tuple_dict_dict[topic_str] = partition_int_offsets_tuple_dict
+        # Select the topics and look up their partitions in one and the same metadata snapshot (the cache may be refreshed in between two separate lookups).
+        topic_str_topicMetadata_dict = self.get_topic_str_topicMetadata_dict()
+        if pattern_str_or_str_list is None:
+            topic_str_list = sorted(topic_str_topicMetadata_dict.keys())
+        else:
+            pattern_str_list = [pattern_str_or_str_list] if isinstance(pattern_str_or_str_list, str) else pattern_str_or_str_list
+            topic_str_list = sorted(filter_str_list(topic_str_topicMetadata_dict, pattern_str_list))
+        topic_str_partition_int_tuple_list = [(topic_str, partition_int) for topic_str in topic_str_list for partition_int in topic_str_topicMetadata_dict[topic_str].partitions.keys()]
+        #
+
+        def get_watermark_offsets(topic_str_partition_int_tuple):
+            topic_str, partition_int = topic_str_partition_int_tuple
+            return consumer.get_watermark_offsets(TopicPartition(topic_str, partition=partition_int), timeout_float)
+
+        # Issue the (blocking) watermark requests for the individual partitions in parallel.
+        topic_str_partition_int_offsets_tuple_dict_dict = {topic_str: {} for topic_str in topic_str_list}
+        if topic_str_partition_int_tuple_list:
+            with ThreadPoolExecutor(max_workers=min(32, len(topic_str_partition_int_tuple_list))) as threadPoolExecutor:
+                offsets_tuple_list = threadPoolExecutor.map(get_watermark_offsets, topic_str_partition_int_tuple_list)
+                for (topic_str, partition_int), offsets_tuple in zip(topic_str_partition_int_tuple_list, offsets_tuple_list):
+                    topic_str_partition_int_offsets_tuple_dict_dict[topic_str][partition_int] = offsets_tuple
         return topic_str_partition_int_offsets_tuple_dict_dict
 
     def topics(self, pattern=None, size=False, partitions=False):
@@ -1721,11 +1875,13 @@ class Cluster:
                 for topic_str in topic_str_total_size_int_size_dict_tuple_dict
             }
         else:
-            topic_str_list = list(self.adminClient.list_topics().topics.keys())
+            topic_str_topicMetadata_dict = self.get_topic_str_topicMetadata_dict()
             if pattern_str_or_str_list is not None:
                 if isinstance(pattern_str_or_str_list, str):
                     pattern_str_or_str_list = [pattern_str_or_str_list]
-                topic_str_list = [topic_str for topic_str in topic_str_list if any(fnmatch(topic_str, pattern_str) for pattern_str in pattern_str_or_str_list)]
+                topic_str_list = filter_str_list(topic_str_topicMetadata_dict, pattern_str_or_str_list)
+            else:
+                topic_str_list = list(topic_str_topicMetadata_dict.keys())
             topic_str_list.sort()
             return topic_str_list
 
@@ -1900,7 +2056,13 @@ class Cluster:
         """
         test_bool = test
         #
-        topic_str_list = self.topics(pattern_str_or_str_list)
+        if isinstance(pattern_str_or_str_list, str):
+            pattern_str_or_str_list = [pattern_str_or_str_list]
+        # Literal topic names are passed on directly (the broker rejects unknown topics); only real patterns need to be resolved against the topics on the cluster.
+        if any(is_pattern(pattern_str) for pattern_str in pattern_str_or_str_list):
+            topic_str_list = self.topics(pattern_str_or_str_list)
+        else:
+            topic_str_list = list(dict.fromkeys(pattern_str_or_str_list))
         #
         for topic_str in topic_str_list:
             self.set_config_dict(ResourceType.TOPIC, topic_str, {key_str: value_str}, test_bool)
@@ -1911,6 +2073,8 @@ class Cluster:
         #
         num_retries_int = 0
         while True:
+            # Always check against fresh metadata.
+            self.topic_str_topicMetadata_dict = None
             if (
                 exists_bool
                 and self.exists(topic_str)
@@ -1956,19 +2120,45 @@ class Cluster:
 
                 c.create("test", block=False)
         """
-        partitions_int = partitions
-        config_dict = config
-        block_bool = block
+        self.create_many([{"topic": topic_str, "partitions": partitions, "config": config}], block=block)
         #
-        config_dict["retention.ms"] = self.kash_dict["retention.ms"]
+        return topic_str
+
+    def create_many(self, topic_dict_list, block=True):
+        """Create several topics at once.
+
+        Create several topics using a single request to the cluster.
+
+        Args:
+            topic_dict_list (:obj:`list(dict)`): List of dictionaries describing the topics to be created. Each dictionary has the key "topic" (the name of the topic) and, optionally, the keys "partitions" (the number of partitions, defaults to 1) and "config" (configuration overrides, defaults to {}; the "retention.ms" from the kash.py cluster configuration is used unless overridden here).
+            block (:obj:`bool`, optional): Block until the topics are created. Defaults to True.
+
+        Returns:
+            :obj:`list(str)`: List of the names of the created topics.
+
+        Examples:
+            Create the topics "test1" with one partition and "test2" with two partitions, and block until they are created::
+
+                c.create_many([{"topic": "test1"}, {"topic": "test2", "partitions": 2}])
+
+            Create the topics "test1" and "test2" with a retention time of 4711ms, and *do not* block until they are created::
+
+                c.create_many([{"topic": "test1", "config": {"retention.ms": "4711"}}, {"topic": "test2", "config": {"retention.ms": "4711"}}], block=False)
+        """
+        block_bool = block
         #
-        newTopic = NewTopic(topic_str, partitions_int, config=config_dict)
-        self.adminClient.create_topics([newTopic])
+        newTopic_list = [NewTopic(topic_dict["topic"], topic_dict.get("partitions", 1), config={"retention.ms": self.kash_dict["retention.ms"], **topic_dict.get("config", {})}) for topic_dict in topic_dict_list]
+        topic_str_list = [newTopic.topic for newTopic in newTopic_list]
         #
-        if block_bool:
-            self.block_topic(topic_str, exists=True)
+        if newTopic_list:
+            self.adminClient.create_topics(newTopic_list)
+            self.topic_str_topicMetadata_dict = None
+            #
+            if block_bool:
+                for topic_str in topic_str_list:
+                    self.block_topic(topic_str, exists=True)
         #
-        return topic_str
+        return topic_str_list
 
     touch = create
     """Create a topic.
@@ -2033,6 +2223,7 @@ class Cluster:
         #
         if topic_str_list:
             self.adminClient.delete_topics(topic_str_list)
+            self.topic_str_topicMetadata_dict = None
             if block_bool:
                 for topic_str in topic_str_list:
                     self.block_topic(topic_str, exists=False)
@@ -2089,29 +2280,46 @@ class Cluster:
         """
         topic_str_list = self.topics(pattern_str_or_str_list)
         #
+        return self.offsets_for_times_multi({topic_str: partition_int_timestamp_int_dict for topic_str in topic_str_list}, timeout=timeout)
+
+    def offsets_for_times_multi(self, topic_str_partition_int_timestamp_int_dict_dict, timeout=-1.0):
+        """Look up offsets corresponding to message timestamps in the partitions of several topics at once.
+
+        Look up those offsets in the individual partitions of the topics given as keys of topic_str_partition_int_timestamp_int_dict_dict which correspond to the timestamps provided for the individual partitions of each topic. All the partitions of all the topics are looked up in a single request.
+
+        Args:
+            topic_str_partition_int_timestamp_int_dict_dict (:obj:`dict(str, dict(int, int))`): Dictionary of strings (topic names) and dictionaries of integers (partitions) and integers (timestamps).
+            timeout (:obj:`float`, optional): The timeout (in seconds) for the offsets_for_times() method call from confluent_kafka.Consumer. Defaults to -1.0 (infinite=no timeout).
+
+        Returns:
+            :obj:`dict(str, dict(int, int))`: Dictionary of strings (topic names) and dictionaries of integers (partitions) and integers (offsets).
+
+        Examples:
+            Look up the offset of the first message in the first partition of the topic "test1" which has a timestamp greater or equal to 1664644769886 milliseconds from epoch, and the offset of the first message in the first partition of the topic "test2" which has a timestamp greater or equal to 1664645155987 milliseconds from epoch::
+
+                c.offsets_for_times_multi({"test1": {0: 1664644769886}, "test2": {0: 1664645155987}})
+        """
+        topicPartition_list = [
+            TopicPartition(topic_str, partition_int, timestamp_int)
+            for topic_str, partition_int_timestamp_int_dict in topic_str_partition_int_timestamp_int_dict_dict.items()
+            for partition_int, timestamp_int in partition_int_timestamp_int_dict.items()
+        ]
+        if not topicPartition_list:
+            return {}
+        #
+        consumer = self.get_dummy_consumer()
+        topicPartition_list1 = consumer.offsets_for_times(topicPartition_list, timeout=timeout)
+        #
         topic_str_partition_int_offsets_int_dict_dict = {}
-        for topic_str in topic_str_list:
-            if topicPartition_list := [
-                TopicPartition(topic_str, partition_int, timestamp_int)
-                for partition_int, timestamp_int in partition_int_timestamp_int_dict.items()
-            ]:
-                config_dict = self.config_dict
-                config_dict["group.id"] = "dummy_group_id"
-                consumer = get_consumer(config_dict)
-                topicPartition_list1 = consumer.offsets_for_times(topicPartition_list, timeout=timeout)
-                partition_int_offset_int_dict = {
-                    topicPartition.partition: topicPartition.offset
-                    for topicPartition in topicPartition_list1
-                }
-                #
-                topic_str_partition_int_offsets_int_dict_dict[topic_str] = partition_int_offset_int_dict
+        for topicPartition in topicPartition_list1:
+            topic_str_partition_int_offsets_int_dict_dict.setdefault(topicPartition.topic, {})[topicPartition.partition] = topicPartition.offset
         #
         return topic_str_partition_int_offsets_int_dict_dict
 
     def describe(self, pattern_str_or_str_list):
         """Describe topics.
 
-        Describe all topics matching the bash-like pattern (or list of patterns) pattern_str_or_str_list.
+        Describe all topics matching the bash-like pattern (or list of patterns) pattern_str_or_str_list. If only literal topic names are given (no "*", "?" or "["), only the metadata of these topics is requested from the cluster, hence prefer literal topic names where possible.
 
         Args:
             pattern_str_or_str_list (:obj:`str` | :obj:`list(str)`): The pattern (or list of patterns) for selecting the topics.
@@ -2131,16 +2339,12 @@ class Cluster:
         if isinstance(pattern_str_or_str_list, str):
             pattern_str_or_str_list = [pattern_str_or_str_list]
         #
-        topic_str_topicMetadata_dict = self.adminClient.list_topics().topics
+        topic_str_topicMetadata_dict = self.get_topic_str_topicMetadata_dict_for_patterns(pattern_str_or_str_list)
         return {
             topic_str: topicMetadata_to_topic_dict(
                 topic_str_topicMetadata_dict[topic_str]
             )
-            for topic_str in topic_str_topicMetadata_dict
-            if any(
-                fnmatch(topic_str, pattern_str)
-                for pattern_str in pattern_str_or_str_list
-            )
+            for topic_str in filter_str_list(topic_str_topicMetadata_dict, pattern_str_or_str_list)
         }
 
     def exists(self, topic_str):
@@ -2159,12 +2363,12 @@ class Cluster:
             
                 c.exists("test")
         """
-        return self.topics(topic_str) != []
+        return filter_str_list(self.get_topic_str_topicMetadata_dict_for_patterns([topic_str]), [topic_str]) != []
 
     def partitions(self, pattern_str_or_str_list):
         """Get the number of partitions of topics.
 
-        Get the number of partitions of all topics matching the bash-like pattern (or list of patterns) pattern_str_or_str_list.
+        Get the number of partitions of all topics matching the bash-like pattern (or list of patterns) pattern_str_or_str_list. If only literal topic names are given (no "*", "?" or "["), only the metadata of these topics is requested from the cluster, hence prefer literal topic names where possible.
 
         Args:
             pattern_str_or_str_list (:obj:`str` | :obj:`list(str)`): The pattern (or list of patterns) for selecting the topics.
@@ -2184,14 +2388,10 @@ class Cluster:
         if isinstance(pattern_str_or_str_list, str):
             pattern_str_or_str_list = [pattern_str_or_str_list]
         #
-        topic_str_topicMetadata_dict = self.adminClient.list_topics().topics
+        topic_str_topicMetadata_dict = self.get_topic_str_topicMetadata_dict_for_patterns(pattern_str_or_str_list)
         return {
             topic_str: len(topic_str_topicMetadata_dict[topic_str].partitions)
-            for topic_str in topic_str_topicMetadata_dict
-            if any(
-                fnmatch(topic_str, pattern_str)
-                for pattern_str in pattern_str_or_str_list
-            )
+            for topic_str in filter_str_list(topic_str_topicMetadata_dict, pattern_str_or_str_list)
         }
 
     def set_partitions(self, pattern_str_or_str_list, num_partitions_int, test=False):
@@ -2225,6 +2425,7 @@ class Cluster:
         #
         for future in topic_str_future_dict.values():
             future.result()
+        self.topic_str_topicMetadata_dict = None
         return {topic_str: num_partitions_int for topic_str in topic_str_list}
 
     # AdminClient - groups
@@ -2631,6 +2832,31 @@ class Cluster:
 
     # Producer
 
+    def get_serializer(self, topic_str, key_bool, type_str, schema_str):
+        # Construct serializers only once. Avro and JSONSchema serializers parse their schema when they are constructed but look up the subject (i.e. register the schema) only when serializing, hence they are shared by all topics (and keys/values) with the same schema. Protobuf serializers are bound to a message type which is registered per topic and key/value.
+        if type_str.lower() in ["avro", "jsonschema"]:
+            serializer_key_tuple = (None, None, type_str.lower(), schema_str)
+        else:
+            serializer_key_tuple = (topic_str, key_bool, type_str.lower(), schema_str)
+        if serializer_key_tuple in self.serializer_key_tuple_generalizedProtocolMessageType_serializer_tuple_dict:
+            return self.serializer_key_tuple_generalizedProtocolMessageType_serializer_tuple_dict[serializer_key_tuple]
+        #
+        if type_str.lower() in ["pb", "protobuf"]:
+            generalizedProtocolMessageType = self.schema_str_to_generalizedProtocolMessageType(schema_str, topic_str, key_bool)
+            serializer = ProtobufSerializer(generalizedProtocolMessageType, self.schemaRegistryClient, {"use.deprecated.format": False})
+        elif type_str.lower() == "avro":
+            generalizedProtocolMessageType = None
+            serializer = AvroSerializer(self.schemaRegistryClient, schema_str)
+        elif type_str.lower() == "jsonschema":
+            generalizedProtocolMessageType = None
+            serializer = JSONSerializer(schema_str, self.schemaRegistryClient)
+        else:
+            raise Exception(f"No serializer for type \"{type_str}\".")
+        #
+        generalizedProtocolMessageType_serializer_tuple = (generalizedProtocolMessageType, serializer)
+        self.serializer_key_tuple_generalizedProtocolMessageType_serializer_tuple_dict[serializer_key_tuple] = generalizedProtocolMessageType_serializer_tuple
+        return generalizedProtocolMessageType_serializer_tuple
+
     def produce(self, topic_str, value, key=None, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, timestamp=CURRENT_TIME, headers=None, on_delivery=None):
         """Produce a message to a topic.
 
@@ -2707,7 +2933,7 @@ class Cluster:
 
             def payload_to_payload_dict(payload):
                 if isinstance(payload, (str, bytes)):
-                    payload_dict = json.loads(payload)
+                    payload_dict = json_loads(payload)
                 else:
                     payload_dict = payload
                 return payload_dict
@@ -2715,39 +2941,78 @@ class Cluster:
             #
             if type_str.lower() == "json":
                 if isinstance(payload, dict):
-                    payload_str_or_bytes = json.dumps(payload)
+                    payload_str_or_bytes = json_dumps(payload)
                 else:
                     payload_str_or_bytes = payload
             elif type_str.lower() in ["pb", "protobuf"]:
-                generalizedProtocolMessageType = self.schema_str_to_generalizedProtocolMessageType(schema_str, topic_str, key_bool)
-                protobufSerializer = ProtobufSerializer(generalizedProtocolMessageType, self.schemaRegistryClient, {"use.deprecated.format": False})
+                (generalizedProtocolMessageType, protobufSerializer) = self.get_serializer(topic_str, key_bool, type_str, schema_str)
                 payload_dict = payload_to_payload_dict(payload)
                 protobuf_message = generalizedProtocolMessageType()
                 ParseDict(payload_dict, protobuf_message)
                 payload_str_or_bytes = protobufSerializer(protobuf_message, SerializationContext(topic_str, messageField))
-            elif type_str.lower() == "avro":
-                avroSerializer = AvroSerializer(self.schemaRegistryClient, schema_str)
-                payload_dict = payload_to_payload_dict(payload)
-                payload_str_or_bytes = avroSerializer(payload_dict, SerializationContext(topic_str, messageField))
-            elif type_str.lower() == "jsonschema":
-                jSONSerializer = JSONSerializer(schema_str, self.schemaRegistryClient)
+            elif type_str.lower() in ["avro", "jsonschema"]:
+                (_, serializer) = self.get_serializer(topic_str, key_bool, type_str, schema_str)
                 payload_dict = payload_to_payload_dict(payload)
-                payload_str_or_bytes = jSONSerializer(payload_dict, SerializationContext(topic_str, messageField))
+                payload_str_or_bytes = serializer(payload_dict, SerializationContext(topic_str, messageField))
             else:
                 payload_str_or_bytes = payload
             return payload_str_or_bytes
 
         #
-        key_str_or_bytes = serialize(key_bool=True)
-        value_str_or_bytes = serialize(key_bool=False)
+        # Plain strings and bytes are handed to the producer as they are.
+        key_str_or_bytes = key if key_type_str.lower() in pass_through_type_str_list else serialize(key_bool=True)
+        value_str_or_bytes = value if value_type_str.lower() in pass_through_type_str_list else serialize(key_bool=False)
         #
         self.producer.produce(topic_str, value_str_or_bytes, key_str_or_bytes, partition=partition_int, timestamp=timestamp_int, headers=headers_dict_or_list, on_delivery=on_delivery)
         #
-        self.produced_messages_counter_int += 1
+        self.count_produced_message(key_str_or_bytes, value_str_or_bytes)
         #
         return key_str_or_bytes, value_str_or_bytes
 
-    def flatmap_from_file(self, path_str, topic_str, flatmap_function, break_function=lambda _: False, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=4096):
+    def produce_list(self, topic_str, value_list, key_list=None, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, timestamp=CURRENT_TIME, headers=None, on_delivery=None):
+        """Produce a list of messages to a topic.
+
+        Produce a list of messages to a topic in one call and wait for all of them to be delivered (i.e. flush the Producer once at the end instead of after each message). The arguments are the same as those of produce(), except for the lists of values and keys.
+
+        Args:
+            topic_str (:obj:`str`): The topic to produce to.
+            value_list (:obj:`list(bytes | str | dict)`): The values of the messages to be produced.
+            key_list (:obj:`list(bytes | str | dict)`, optional): The keys of the messages to be produced (same length as value_list). If set to None, all keys are None. Defaults to None.
+            key_type (:obj:`str`, optional): The key type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
+            value_type (:obj:`str`, optional): The value type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
+            key_schema (:obj:`str`, optional): The schema of the keys of the messages to be produced (if key_type is either "avro", "protobuf" or "pb", or "jsonschema"). Defaults to None.
+            value_schema (:obj:`str`, optional): The schema of the values of the messages to be produced (if value_type is either "avro", "protobuf" or "pb", or "jsonschema"). Defaults to None.
+            partition (:obj:`int`, optional): The partition to produce to. Defaults to RD_KAFKA_PARTITION_UA = -1, i.e., the partition is selected by configured built-in partitioner.
+            timestamp (:obj:`int`, optional): Message timestamp (CreateTime) in milliseconds since epoch UTC. Defaults to CURRENT_TIME = 0.
+            headers (:obj:`dict` | :obj:`list`, optional): Message headers to set on all the messages. Defaults to None.
+            on_delivery (:obj:`function`, optional): Delivery report callback to call for each of the messages. Defaults to None.
+
+        Returns:
+            :obj:`list(tuple(bytes | str, bytes | str))`: List of pairs of the keys and the values of the produced messages.
+
+        Examples:
+            Produce three messages with values "message 1", "message 2" and "message 3" and keys = None to the topic "test"::
+
+                c.produce_list("test", ["message 1", "message 2", "message 3"])
+        """
+        if key_list is None:
+            key_list = [None] * len(value_list)
+        #
+        key_str_or_bytes_value_str_or_bytes_tuple_list = [self.produce(topic_str, value, key=key, key_type=key_type, value_type=value_type, key_schema=key_schema, value_schema=value_schema, partition=partition, timestamp=timestamp, headers=headers, on_delivery=on_delivery) for key, value in zip(key_list, value_list)]
+        #
+        self.flush()
+        #
+        return key_str_or_bytes_value_str_or_bytes_tuple_list
+
+    def count_produced_message(self, key_str_or_bytes, value_str_or_bytes):
+        self.produced_messages_counter_int += 1
+        self.unpolled_messages_counter_int += 1
+        if key_str_or_bytes is not None:
+            self.unpolled_bytes_counter_int += len(key_str_or_bytes)
+        if value_str_or_bytes is not None:
+            self.unpolled_bytes_counter_int += len(value_str_or_bytes)
+
+    def flatmap_from_file(self, path_str, topic_str, flatmap_function, break_function=never_break, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=1048576):
         """Read messages from a local file and produce them to a topic, while transforming the messages in a flatmap-like manner.
 
         Read messages from a local file with path path_str and produce them to topic topic_str, while transforming the messages in a flatmap-like manner.
@@ -2756,7 +3021,7 @@ class Cluster:
             path_str (:obj:`str`): The path to the local file to read from.
             topic_str (:obj:`str`): The topic to produce to.
             flatmap_function (:obj:`function`): Flatmap function (takes a pair of a key (string) and a value (string) and returns a list of pairs of keys (string) and values (string)).
-            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to lambda _: False, i.e., always continue reading.
+            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to never_break, i.e., always continue reading.
             key_type (:obj:`str`, optional): The key type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             value_type (:obj:`str`, optional): The value type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             key_schema (:obj:`str`, optional): The schema of the key of the message to be produced (if key_type is either "avro", "protobuf" or "pb", or "jsonschema"). Defaults to None.
@@ -2766,7 +3031,7 @@ class Cluster:
             key_value_separator (:obj:`str`, optional): The separator between the keys and the values in the local file to read from, e.g. ":". If set to None, only read the values, not the keys. Defaults to None.
             message_separator (:obj:`str`, optional): The separator between individual messages in the local file to read from. Defaults to the newline character.
             n (:obj:`int`, optional): The number of messages to read from the local file. Defaults to ALL_MESSAGES = -1.
-            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 4096.
+            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 1048576 (1 MiB).
 
         Returns:
             :obj:`tuple(int, int)` Pair of the number of messages read from the local file (integer) and the number of messages produced to the topic (integer).
@@ -2784,18 +3049,25 @@ class Cluster:
 
                 c.flatmap("./snacks_value.txt", "test", flatmap_function=lambda x: [x], value_type="protobuf", value_schema='message Snack { required string name = 1; required float calories = 2; optional string colour = 3; }')
         """
+        # Plain strings and bytes do not need to be serialized, hence hand them to the producer directly instead of going through produce().
+        if key_type.lower() in pass_through_type_str_list and value_type.lower() in pass_through_type_str_list:
+            producer_produce = self.producer.produce
+
+            def produce(key_str, value_str):
+                producer_produce(topic_str, value_str, key_str, partition=partition, on_delivery=on_delivery)
+                self.count_produced_message(key_str, value_str)
+        else:
+            def produce(key_str, value_str):
+                self.produce(topic_str, value_str, key=key_str, key_type=key_type, value_type=value_type, key_schema=key_schema, value_schema=value_schema, partition=partition, on_delivery=on_delivery)
+        #
 
         def foldl_function(_, key_str_value_str_tuple):
-            key_str = key_str_value_str_tuple[0]
-            value_str = key_str_value_str_tuple[1]
-            #
-            key_str_value_str_tuple_list = flatmap_function((key_str, value_str))
+            key_str_value_str_tuple_list = flatmap_function(key_str_value_str_tuple)
             #
             for (key_str, value_str) in key_str_value_str_tuple_list:
-                self.produce(topic_str, value_str, key=key_str, key_type=key_type, value_type=value_type, key_schema=key_schema, value_schema=value_schema, partition=partition, on_delivery=on_delivery)
+                produce(key_str, value_str)
                 #
-                if self.produced_messages_counter_int % self.kash_dict["flush.num.messages"] == 0:
-                    self.flush()
+                self.poll()
                 #
                 if self.verbose_int > 0 and self.produced_messages_counter_int % self.kash_dict["progress.num.messages"] == 0:
                     print(f"Produced: {self.produced_messages_counter_int}")
@@ -2808,7 +3080,7 @@ class Cluster:
         #
         return (lines_counter_int, self.produced_messages_counter_int)
 
-    def map_from_file(self, path_str, topic_str, map_function, break_function=lambda _: False, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=4096):
+    def map_from_file(self, path_str, topic_str, map_function, break_function=never_break, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=1048576):
         """Read messages from a local file and produce them to a topic, while transforming the messages in a map-like manner.
 
         Read messages from a local file with path path_str and produce them to topic topic_str, while transforming the messages in a map-like manner.
@@ -2817,7 +3089,7 @@ class Cluster:
             path_str (:obj:`str`): The path to the local file to read from.
             topic_str (:obj:`str`): The topic to produce to.
             map_function (:obj:`function`): Map function (takes a pair of a key (string) and a value (string) and returns a transformed pair of key (string) and value (string)).
-            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to lambda _: False, i.e., always continue reading.
+            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to never_break, i.e., always continue reading.
             key_type (:obj:`str`, optional): The key type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             value_type (:obj:`str`, optional): The value type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             key_schema (:obj:`str`, optional): The schema of the key of the message to be produced (if key_type is either "avro", "protobuf" or "pb", or "jsonschema"). Defaults to None.
@@ -2827,7 +3099,7 @@ class Cluster:
             key_value_separator (:obj:`str`, optional): The separator between the keys and the values in the local file to read from, e.g. ":". If set to None, only read the values, not the keys. Defaults to None.
             message_separator (:obj:`str`, optional): The separator between individual messages in the local file to read from. Defaults to the newline character.
             n (:obj:`int`, optional): The number of messages to read from the local file. Defaults to ALL_MESSAGES = -1.
-            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 4096.
+            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 1048576 (1 MiB).
 
         Returns:
             :obj:`tuple(int, int)` Pair of the number of messages read from the local file (integer) and the number of messages produced to the topic (integer).
@@ -2843,7 +3115,7 @@ class Cluster:
         #
         return self.flatmap_from_file(path_str, topic_str, flatmap_function, break_function=break_function, key_type=key_type, value_type=value_type, key_schema=key_schema, value_schema=value_schema, partition=partition, on_delivery=on_delivery, key_value_separator=key_value_separator, message_separator=message_separator, n=n, bufsize=bufsize)
 
-    def filter_from_file(self, path_str, topic_str, filter_function, break_function=lambda _: False, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=4096):
+    def filter_from_file(self, path_str, topic_str, filter_function, break_function=never_break, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=1048576):
         """Read messages from a local file and produce them to a topic, while only keeping those messages which fulfil a filter condition.
 
         Read messages from a local file with path path_str and produce them to topic topic_str, while only keeping those messages which fulfil a filter condition.
@@ -2852,7 +3124,7 @@ class Cluster:
             path_str (:obj:`str`): The path to the local file to read from.
             topic_str (:obj:`str`): The topic to produce to.
             filter_function (:obj:`function`): Filter function (takes a pair of a key (string) and a value (string) and returns a boolean; if True keeps the message, if False drops it).
-            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to lambda _: False, i.e., always continue reading.
+            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to never_break, i.e., always continue reading.
             key_type (:obj:`str`, optional): The key type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             value_type (:obj:`str`, optional): The value type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             key_schema (:obj:`str`, optional): The schema of the key of the message to be produced (if key_type is either "avro", "protobuf" or "pb", or "jsonschema"). Defaults to None.
@@ -2862,7 +3134,7 @@ class Cluster:
             key_value_separator (:obj:`str`, optional): The separator between the keys and the values in the local file to read from, e.g. ":". If set to None, only read the values, not the keys. Defaults to None.
             message_separator (:obj:`str`, optional): The separator between individual messages in the local file to read from. Defaults to the newline character.
             n (:obj:`int`, optional): The number of messages to read from the local file. Defaults to ALL_MESSAGES = -1.
-            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 4096.
+            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 1048576 (1 MiB).
 
         Returns:
             :obj:`tuple(int, int)` Pair of the number of messages read from the local file (integer) and the number of messages produced to the topic (integer).
@@ -2878,7 +3150,7 @@ class Cluster:
         #
         return self.flatmap_from_file(path_str, topic_str, flatmap_function, break_function=break_function, key_type=key_type, value_type=value_type, key_schema=key_schema, value_schema=value_schema, partition=partition, on_delivery=on_delivery, key_value_separator=key_value_separator, message_separator=message_separator, n=n, bufsize=bufsize)
 
-    def upload(self, path_str, topic_str, flatmap_function=lambda x: [x], break_function=lambda _: False, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=4096):
+    def upload(self, path_str, topic_str, flatmap_function=lambda x: [x], break_function=never_break, key_type="str", value_type="str", key_schema=None, value_schema=None, partition=RD_KAFKA_PARTITION_UA, on_delivery=None, key_value_separator=None, message_separator="\n", n=ALL_MESSAGES, bufsize=1048576):
         """Upload messages from a local file to a topic, while optionally transforming the messages in a flatmap-like manner.
 
         Read messages from a local file with path path_str and produce them to topic topic_str, while optionally transforming the messages in a flatmap-like manner.
@@ -2887,7 +3159,7 @@ class Cluster:
             path_str (:obj:`str`): The path to the local file to read from.
             topic_str (:obj:`str`): The topic to produce to.
             flatmap_function (:obj:`function`, optional): Flatmap function (takes a pair of key (string) and value (string) and returns a list of pairs of keys and values). Defaults to lambda x: [x] (=the identify function for flatmap, leading to a one-to-one copy from the messages in the file to the messages in the topic).
-            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to lambda _: False, i.e., always continue reading.
+            break_function (:obj:`function`, optional): The break function (takes a pair of strings (key and value) and returns True (stop reading from the file) or False (continue reading)). Defaults to never_break, i.e., always continue reading.
             key_type (:obj:`str`, optional): The key type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             value_type (:obj:`str`, optional): The value type ("bytes", "str", "json", "avro", "protobuf" or "pb", or "jsonschema"). Defaults to "str".
             key_schema (:obj:`str`, optional): The schema of the key of the message to be produced (if key_type is either "avro", "protobuf" or "pb", or "jsonschema"). Defaults to None.
@@ -2897,7 +3169,7 @@ class Cluster:
             key_value_separator (:obj:`str`, optional): The separator between the keys and the values in the local file to read from, e.g. ":". If set to None, only read the values, not the keys. Defaults to None.
             message_separator (:obj:`str`, optional): The separator between individual messages in the local file to read from. Defaults to the newline character.
             n (:obj:`int`, optional): The number of messages to read from the local file. Defaults to ALL_MESSAGES = -1.
-            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 4096.
+            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 1048576 (1 MiB).
 
         Returns:
             :obj:`tuple(int, int)` Pair of the number of messages read from the local file (integer) and the number of messages produced to the topic (integer).
@@ -2923,6 +3195,34 @@ class Cluster:
         Wait for all messages in the Producer queue to be delivered. Uses the "flush.timeout" setting from the cluster configuration file ("kash"-section).
         """
         self.producer.flush(self.kash_dict["flush.timeout"])
+        #
+        self.unpolled_messages_counter_int = 0
+        self.unpolled_bytes_counter_int = 0
+        self.last_poll_timestamp_float = time.monotonic()
+
+    def poll(self):
+        """Serve delivery reports of the Producer without waiting for all queued messages to be delivered.
+
+        Call confluent_kafka.Producer.poll(0) (non-blocking) if at least "flush.num.messages" messages or "flush.num.bytes" bytes have been produced, or at least "flush.interval" seconds have passed, since the last poll (settings from the cluster configuration file ("kash"-section)). If the Producer queue is more than 90% full, block in short intervals until it has drained below that level.
+
+        Returns:
+            :obj:`bool`: True if the producer has been polled, False otherwise.
+        """
+        while len(self.producer) >= self.producer_queue_high_watermark_int:
+            self.producer.poll(0.1)
+        #
+        if (
+            self.unpolled_messages_counter_int >= self.kash_dict["flush.num.messages"]
+            or self.unpolled_bytes_counter_int >= self.kash_dict["flush.num.bytes"]
+            or time.monotonic() - self.last_poll_timestamp_float >= self.kash_dict["flush.interval"]
+        ):
+            self.producer.poll(0)
+            #
+            self.unpolled_messages_counter_int = 0
+            self.unpolled_bytes_counter_int = 0
+            self.last_poll_timestamp_float = time.monotonic()
+            return True
+        return False
 
     # Consumer
 
@@ -2972,9 +3272,11 @@ class Cluster:
         self.config_dict["auto.offset.reset"] = self.kash_dict["auto.offset.reset"]
         self.config_dict["enable.auto.commit"] = self.kash_dict["enable.auto.commit"]
         self.config_dict["session.timeout.ms"] = self.kash_dict["session.timeout.ms"]
-        for key_str, value in config_dict.items():
+        self.config_dict["queued.max.messages.kbytes"] = self.kash_dict["queued.max.messages.kbytes"]
+        for key_str, value in self.consumer_config_dict.items():
             self.config_dict[key_str] = value
-        self.consumer = get_consumer(self.config_dict)
+        # The configuration passed to this method only augments this subscription, it is not kept for later ones.
+        self.consumer = get_consumer({**self.config_dict, **config_dict})
         #
         clusterMetaData = self.consumer.list_topics(topic=topic_str)
         self.topicPartition_list = [TopicPartition(topic_str, partition_int) for partition_int in clusterMetaData.topics[topic_str].partitions.keys()]
@@ -2993,6 +3295,8 @@ class Cluster:
         self.subscribed_group_str = group_str
         self.subscribed_key_type_str = key_type
         self.subscribed_value_type_str = value_type
+        # The key and value types are fixed for the lifetime of the subscription, hence bind the conversion function once here.
+        self.subscribed_message_to_message_dict = self.get_message_to_message_dict_function(key_type, value_type)
         #
         return topic_str, group_str
 
@@ -3013,6 +3317,7 @@ class Cluster:
         self.subscribed_group_str = None
         self.subscribed_key_type_str = None
         self.subscribed_value_type_str = None
+        self.subscribed_message_to_message_dict = None
         #
         return topic_str, group_str
 
@@ -3024,13 +3329,14 @@ class Cluster:
         self.consumer.unsubscribe()
         self.consumer.close()
 
-    def consume(self, n=1):
+    def consume(self, n=1, timeout=None):
         """Consume messages from a subscribed topic.
 
-        Consume messages from a subscribed topic.
+        Consume messages from a subscribed topic. Fetches up to n messages in one call to confluent_kafka.Consumer.consume().
 
         Args:
             n (:obj:`int`, optional): Maximum number of messages to return. Defaults to 1.
+            timeout (:obj:`float`, optional): Maximum time (in seconds) to wait for the messages. If set to None, use the "consume.timeout" setting from the cluster configuration file ("kash"-section). Defaults to None.
 
         Returns:
             :obj:`list(message_dict)`: List of message dictionaries (converted from confluent_kafka.Message).
@@ -3043,24 +3349,22 @@ class Cluster:
             Consume the next 100 messages from the topic subscribed to before::
 
                 c.consume(n=100)
+
+            Consume the next 100 messages from the topic subscribed to before, waiting at most 2 seconds::
+
+                c.consume(n=100, timeout=2.0)
         """
         num_messages_int = n
+        timeout_float = self.kash_dict["consume.timeout"] if timeout is None else timeout
         #
         if self.subscribed_topic_str is None:
             print("Please subscribe to a topic before consuming.")
             return
         #
-        message_list = self.consumer.consume(num_messages_int, self.kash_dict["consume.timeout"])
+        message_list = self.consumer.consume(num_messages_int, timeout_float)
         if message_list:
             self.last_consumed_message = message_list[-1]
-        return [
-            self.message_to_message_dict(
-                message,
-                key_type=self.subscribed_key_type_str,
-                value_type=self.subscribed_value_type_str,
-            )
-            for message in message_list
-        ]
+        return list(map(self.subscribed_message_to_message_dict, message_list))
 
     def commit(self, asynchronous=False):
         """Commit the last consumed message from the topic subscribed to.
@@ -3207,7 +3511,7 @@ class Cluster:
 
     #
 
-    def foldl(self, topic_str, foldl_function, initial_acc, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def foldl(self, topic_str, foldl_function, initial_acc, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic and transform them in a foldl-like manner.
 
         Subscribe to and consume messages from a topic and transform them in a foldl-like manner, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3216,7 +3520,7 @@ class Cluster:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             foldl_function (:obj:`function`): Foldl function (takes an accumulator (any type) and a message dictionary and returns the updated accumulator).
             initial_acc: Initial value of the accumulator (any type).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. Creates a new unique consumer group name if set to None. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3237,50 +3541,86 @@ class Cluster:
 
                 c.foldl("test", lambda acc, x: acc + x["value"]["calories"], 0, value_type="json")
         """
+        acc = initial_acc
+        for message_dict in self.consume_message_dicts(topic_str, break_function, group, offsets, config, key_type, value_type, n, batch_size):
+            acc = foldl_function(acc, message_dict)
+        #
+        return (acc, self.consumed_messages_counter_int)
+
+    def consume_message_dicts(self, topic_str, break_function, group, offsets, config, key_type, value_type, n, batch_size):
+        # Consume loop shared by foldl() and foreach(): yields the message dictionaries one by one (each message is only decoded right before it is processed) until the first message for which break_function returns True.
         num_messages_int = n
         batch_size_int = batch_size
         #
-        self.subscribe(topic_str, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type)
+        # Offsets are stored explicitly and only for the messages which have actually been processed, so that neither the rest of a batch after a break nor a batch fetched ahead of time is committed on close().
+        self.subscribe(topic_str, group=group, offsets=offsets, config={**config, "enable.auto.offset.store": False}, key_type=key_type, value_type=value_type)
         #
-        acc = initial_acc
-        message_counter_int = 0
+        consume_timeout_float = self.kash_dict["consume.timeout"]
+        message_to_message_dict = self.subscribed_message_to_message_dict
+        #
+        self.consumed_messages_counter_int = 0
         break_bool = False
-        while True:
-            message_dict_list = self.consume(n=batch_size_int)
-            if not message_dict_list:
-                break
+        unlimited_bool = num_messages_int == ALL_MESSAGES
+        progress_num_messages_int = self.kash_dict["progress.num.messages"]
+        next_progress_int = progress_num_messages_int
+        # Fetch the next batch in the background while the current batch is being processed (the consumer releases the GIL while waiting for messages) - but only without a break function, after which the fetched batch would be wasted and leaving the loop would have to wait for the pending fetch. Messages are only decoded in this thread.
+        prefetch_bool = break_function is never_break
+        with ThreadPoolExecutor(max_workers=1) as threadPoolExecutor:
+
+            def fetch(num_consumed_messages_int):
+                # Never fetch more messages than are still needed to reach n.
+                return threadPoolExecutor.submit(self.consumer.consume, batch_size_int if unlimited_bool else min(batch_size_int, num_messages_int - num_consumed_messages_int), consume_timeout_float)
             #
-            for message_dict in message_dict_list:
-                if break_function(message_dict):
-                    break_bool = True
+            future = fetch(0)
+            while True:
+                message_list = future.result()
+                if not message_list:
                     break
-                acc = foldl_function(acc, message_dict)
-            #
-            message_counter_int += len(message_dict_list)
-            #
-            if break_bool:
-                break
-            #
-            if self.verbose_int > 0 and message_counter_int % self.kash_dict["progress.num.messages"] == 0:
-                print(f"Consumed: {message_counter_int}")
-            if (
-                num_messages_int != ALL_MESSAGES
-                and message_counter_int >= num_messages_int
-            ):
-                break
+                #
+                if prefetch_bool:
+                    if unlimited_bool or self.consumed_messages_counter_int + len(message_list) < num_messages_int:
+                        future = fetch(self.consumed_messages_counter_int + len(message_list))
+                    for message in message_list:
+                        yield message_to_message_dict(message)
+                    processed_message_list = message_list
+                else:
+                    processed_message_list = message_list
+                    for index_int, message in enumerate(message_list):
+                        message_dict = message_to_message_dict(message)
+                        if break_function(message_dict):
+                            break_bool = True
+                            processed_message_list = message_list[:index_int]
+                            break
+                        yield message_dict
+                #
+                if processed_message_list:
+                    self.consumer.store_offsets(offsets=[TopicPartition(message.topic(), message.partition(), message.offset() + 1) for message in processed_message_list])
+                    self.last_consumed_message = processed_message_list[-1]
+                self.consumed_messages_counter_int += len(message_list)
+                #
+                if break_bool:
+                    break
+                #
+                if self.verbose_int > 0 and self.consumed_messages_counter_int >= next_progress_int:
+                    print(f"Consumed: {self.consumed_messages_counter_int}")
+                    next_progress_int = (self.consumed_messages_counter_int // progress_num_messages_int + 1) * progress_num_messages_int
+                if not unlimited_bool and self.consumed_messages_counter_int >= num_messages_int:
+                    break
+                #
+                if not prefetch_bool:
+                    future = fetch(self.consumed_messages_counter_int)
         self.close()
-        return (acc, message_counter_int)
 
     #
 
-    def flatmap(self, topic_str, flatmap_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def flatmap(self, topic_str, flatmap_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic and transform them in a flatmap-like manner.
 
         Subscribe to and consume messages from a topic and transform them in a flatmap-like manner, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
 
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
-            flatmap_function (:obj:`function`): Flatmap function (takes a message dictionary and returns a list of anything).                break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            flatmap_function (:obj:`function`): Flatmap function (takes a message dictionary and returns a list of anything).                break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3301,15 +3641,15 @@ class Cluster:
 
                 c.flatmap("test", lambda x: [x, x, x])
         """
-        def foldl_function(acc, message_dict):
-            acc += flatmap_function(message_dict)
-            return acc
+        def foldl_function(acc_message_dict_list, message_dict):
+            acc_message_dict_list.extend(flatmap_function(message_dict))
+            return acc_message_dict_list
         #
         return self.foldl(topic_str, foldl_function, [], break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, n=n, batch_size=batch_size)
 
     #
 
-    def filter(self, topic_str, filter_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def filter(self, topic_str, filter_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic and return only those messages fulfilling a filter condition.
 
         Subscribe to and consume messages from a topic and return only those messages fulfilling a filter condition, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3317,7 +3657,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             filter_function (:obj:`function`): Filter function (takes a message dictionary and returns a boolean; if True, keep the message, if False, drop it).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3346,7 +3686,7 @@ class Cluster:
 
     #
 
-    def map(self, topic_str, map_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def map(self, topic_str, map_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic and transform them in a map-like manner.
 
         Subscribe to and consume messages from a topic and transform them in a map-like manner, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3354,7 +3694,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             map_function (:obj:`function`): Map function (takes a message dictionary and returns anything).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3382,7 +3722,7 @@ class Cluster:
 
     #
 
-    def foreach(self, topic_str, foreach_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def foreach(self, topic_str, foreach_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic and call an operation on each of them.
 
         Subscribe to and consume messages from a topic and call an operation on each of them, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3390,7 +3730,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             foreach_function (:obj:`function`): Foreach function (takes a message dictionary and returns None).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3407,21 +3747,14 @@ class Cluster:
 
                 c.foreach("test", print)
         """
-        num_messages_int = n
-        batch_size_int = batch_size
-        #
-
-        def foldl_function(_, message_dict):
+        for message_dict in self.consume_message_dicts(topic_str, break_function, group, offsets, config, key_type, value_type, n, batch_size):
             foreach_function(message_dict)
-            return None
         #
-        (_, message_counter_int) = self.foldl(topic_str, foldl_function, None, break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, n=num_messages_int, batch_size=batch_size_int)
-        #
-        return message_counter_int
+        return self.consumed_messages_counter_int
 
     #
 
-    def cat(self, topic_str, foreach_function=print, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def cat(self, topic_str, foreach_function=print, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic and call an operation on each of them.
 
         Subscribe to and consume messages from a topic and call an operation on each of them, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3429,7 +3762,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             foreach_function (:obj:`function`, optional): Foreach function (takes a message dictionary and returns None). Defaults to ``print``.
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3450,7 +3783,7 @@ class Cluster:
 
     #
 
-    def grep_fun(self, topic_str, match_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def grep_fun(self, topic_str, match_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Find matching messages in a topic (custom function matching).
 
         Find matching messages in a topic using a custom match function match_function. Optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3458,7 +3791,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             match_function (:obj:`function`): Match function (takes a message dictionary and returns a True for a match and False otherwise).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3478,22 +3811,21 @@ class Cluster:
         num_messages_int = n
         batch_size_int = batch_size
         #
+        matching_message_dict_list = []
 
-        def flatmap_function(message_dict):
+        def foreach_function(message_dict):
             if match_function(message_dict):
                 if self.verbose_int > 0:
                     partition_int = message_dict["partition"]
                     offset_int = message_dict["offset"]
                     print(f"Found matching message on partition {partition_int}, offset {offset_int}.")
-                return [message_dict]
-            else:
-                return []
+                matching_message_dict_list.append(message_dict)
         #
-        (matching_message_dict_list, message_counter_int) = self.flatmap(topic_str, flatmap_function, break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, n=num_messages_int, batch_size=batch_size_int)
+        message_counter_int = self.foreach(topic_str, foreach_function, break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, n=num_messages_int, batch_size=batch_size_int)
         #
         return matching_message_dict_list, len(matching_message_dict_list), message_counter_int
 
-    def grep(self, topic_str, re_pattern_str, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def grep(self, topic_str, re_pattern_str, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Find matching messages in a topic (regular expression matching).
 
         Find matching messages in a topic using regular expression matching. Optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3501,7 +3833,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             re_pattern_str (:obj:`str`): Regular expression to for matching messages.
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3518,8 +3850,9 @@ class Cluster:
 
                 c.grep("test", ".*name.*cake")
         """
+        pattern = re.compile(re_pattern_str)
+
         def match_function(message_dict):
-            pattern = re.compile(re_pattern_str)
             key_str = str(message_dict["key"])
             value_str = str(message_dict["value"])
             return pattern.match(key_str) is not None or pattern.match(value_str) is not None
@@ -3528,14 +3861,14 @@ class Cluster:
 
     #
 
-    def wc(self, topic_str, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
+    def wc(self, topic_str, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", n=ALL_MESSAGES, batch_size=1):
         """Count the number of messages, words, and bytes in a topic.
 
         Count the number of messages, words, and bytes in a topic. Optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
 
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3571,7 +3904,7 @@ class Cluster:
 
     #
 
-    def flatmap_to_file(self, topic_str, path_str, flatmap_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
+    def flatmap_to_file(self, topic_str, path_str, flatmap_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic, transform them in a flatmap-like manner and write the resulting messages to a local file.
 
         Subscribe to and consume messages from a topic, transform them in a flatmap-like manner and write the resulting messages to a local file, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3579,7 +3912,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             flatmap_function (:obj:`function`): Flatmap function (takes a message dictionary and returns a list of message dictionaries).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3608,41 +3941,40 @@ class Cluster:
         overwrite_bool = overwrite
         #
         mode_str = "w" if overwrite_bool else "a"
+        # Lines are collected and written in chunks of (at least) this many lines, i.e. with one (large) write call per chunk.
+        write_num_lines_int = 1000
         #
 
+        def write(textIOWrapper, output_str_list):
+            textIOWrapper.write(message_separator_str.join(output_str_list) + message_separator_str)
+
         def foldl_function(acc, message_dict):
-            (textIOWrapper, line_counter_int) = acc
+            (textIOWrapper, output_str_list, line_counter_int) = acc
             #
             message_dict_list = flatmap_function(message_dict)
+            if not message_dict_list:
+                return acc
             #
-            output_str_list = []
-            for message_dict in message_dict_list:
-                value = message_dict["value"]
-                if isinstance(value, dict):
-                    value = json.dumps(value)
-                #
-                if key_value_separator_str is None:
-                    output = value
-                else:
-                    key = message_dict["key"]
-                    if isinstance(key, dict):
-                        key = json.dumps(key)
-                    output = f"{key}{key_value_separator_str}{value}"
-                #
-                output_str = f"{output}{message_separator_str}"
-                output_str_list.append(output_str)
+            if key_value_separator_str is None:
+                output_str_list.extend(payload_to_str(message_dict["value"]) for message_dict in message_dict_list)
+            else:
+                output_str_list.extend(f"{payload_to_str(message_dict['key'])}{key_value_separator_str}{payload_to_str(message_dict['value'])}" for message_dict in message_dict_list)
+            line_counter_int += len(message_dict_list)
             #
-            textIOWrapper.writelines(output_str_list)
-            line_counter_int += len(output_str_list)
+            if len(output_str_list) >= write_num_lines_int:
+                write(textIOWrapper, output_str_list)
+                output_str_list = []
             #
-            return (textIOWrapper, line_counter_int)
+            return (textIOWrapper, output_str_list, line_counter_int)
         #
-        with open(path_str, mode_str) as textIOWrapper:
-            ((_, line_counter_int), message_counter_int) = self.foldl(topic_str, foldl_function, (textIOWrapper, 0), break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, n=n, batch_size=batch_size)
+        with open(path_str, mode_str, buffering=1048576, encoding="utf-8", newline="") as textIOWrapper:
+            ((_, output_str_list, line_counter_int), message_counter_int) = self.foldl(topic_str, foldl_function, (textIOWrapper, [], 0), break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, n=n, batch_size=batch_size)
+            if output_str_list:
+                write(textIOWrapper, output_str_list)
         #
         return message_counter_int, line_counter_int
 
-    def map_to_file(self, topic_str, path_str, map_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
+    def map_to_file(self, topic_str, path_str, map_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic, transform them in a map-like manner and write the resulting messages to a local file.
 
         Subscribe to and consume messages from a topic, transform them in a map-like manner and write the resulting messages to a local file, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3650,7 +3982,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             map_function (:obj:`function`): Map function (takes a message dictionary and returns a message dictionary).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3675,7 +4007,7 @@ class Cluster:
         #
         return self.flatmap_to_file(topic_str, path_str, flatmap_function, break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, key_value_separator=key_value_separator, message_separator=message_separator, overwrite=overwrite, n=n, batch_size=batch_size)
 
-    def filter_to_file(self, topic_str, path_str, filter_function, break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
+    def filter_to_file(self, topic_str, path_str, filter_function, break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
         """Subscribe to and consume messages from a topic and write only those messages to a local file which fulfil a filter condition.
 
         Subscribe to and consume messages from a topic and write only those messages to a file which fulfil a filter condition, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3683,7 +4015,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             filter_function (:obj:`function`): Filter function (takes a message dictionary and returns a boolean; if True, keep the message, if False, drop it).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3708,7 +4040,7 @@ class Cluster:
         #
         return self.flatmap_to_file(topic_str, path_str, flatmap_function, break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, key_value_separator=key_value_separator, message_separator=message_separator, overwrite=overwrite, n=n, batch_size=batch_size)
 
-    def download(self, topic_str, path_str, flatmap_function=lambda x: [x], break_function=lambda _: False, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
+    def download(self, topic_str, path_str, flatmap_function=lambda x: [x], break_function=never_break, group=None, offsets=None, config={}, key_type="str", value_type="str", key_value_separator=None, message_separator="\n", overwrite=True, n=ALL_MESSAGES, batch_size=1):
         """Download messages from a topic to a local file while optionally transforming them in a flatmap-like manner.
 
         Subscribe to and consume messages from a topic, optionally transform them in a flatmap-like manner and write the resulting messages to a local file, optionally explicitly set the consumer group, initial offsets, and augment the consumer configuration. Stops either if the consume timeout is exceeded (``consume.timeout`` in the kash.py cluster configuration) or the number of messages specified in ``n`` has been consumed.
@@ -3716,7 +4048,7 @@ class Cluster:
         Args:
             topic_str (:obj:`str`): The topic to subscribe to and consume from.
             flatmap_function (:obj:`function`, optional): Flatmap function (takes a message dictionary and returns a list of message dictionaries). Defaults to lambda x: [x] (=the identify function for flatmap, leading to a one-to-one copy from the messages in the topic to the messages in the file).
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to lambda _: False, i.e., always continue consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop consuming the topic) or False (continue consuming)). Defaults to never_break, i.e., always continue consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3738,7 +4070,7 @@ class Cluster:
         """
         return self.flatmap_to_file(topic_str, path_str, flatmap_function, break_function=break_function, group=group, offsets=offsets, config=config, key_type=key_type, value_type=value_type, key_value_separator=key_value_separator, message_separator=message_separator, overwrite=overwrite, n=n, batch_size=batch_size)
 
-    def cp(self, source_str, target_str, break_function=lambda _: False, group=None, offsets=None, config={}, flatmap_function=lambda x: [x], source_key_type="str", source_value_type="str", target_key_type="str", target_value_type="str", target_key_schema=None, target_value_schema=None, key_value_separator=None, message_separator="\n", overwrite=True, keep_timestamps=True, n=ALL_MESSAGES, batch_size=1, bufsize=4096):
+    def cp(self, source_str, target_str, break_function=never_break, group=None, offsets=None, config={}, flatmap_function=lambda x: [x], source_key_type="str", source_value_type="str", target_key_type="str", target_value_type="str", target_key_schema=None, target_value_schema=None, key_value_separator=None, message_separator="\n", overwrite=True, keep_timestamps=True, n=ALL_MESSAGES, batch_size=1, bufsize=1048576):
         """Copy local files to topics, topics to local files, or topics to topics.
 
         Copy files to topics, topics to files, or topics to topics. Uses ``Cluster.upload()`` for copying files to topics, ``Cluster.download()`` for copying topics to files, and ``cp`` for copying topics to topics. Paths to local files are distinguished from topics by having a forward slash "/" in their path.
@@ -3746,7 +4078,7 @@ class Cluster:
         Args:
             source_str (:obj:`str`): The source local file/topic.
             target_str (:obj:`str`): The target local file/topic.
-            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop reading the file/consuming the topic) or False (continue reading/consuming)). Defaults to lambda _: False, i.e., always continue reading/consuming.
+            break_function (:obj:`function`, optional): The break function (takes a message dictionary and returns True (stop reading the file/consuming the topic) or False (continue reading/consuming)). Defaults to never_break, i.e., always continue reading/consuming.
             group (:obj:`str`, optional): Consumer group name used for subscribing to the topic to consume from. If set to None, creates a new unique consumer group name. Defaults to None.
             offsets (:obj:`dict(int, int)`, optional): Dictionary of offsets (keys: partitions (int), values: offsets for the partitions (int)) for subscribing to the topic to consume from. If set to None, subscribe to the topic using the offsets from the consumer group. Defaults to None.
             config (:obj:`dict(str, str)`, optional): Dictionary of strings (keys) and strings (values) to augment the consumer configuration for the topic. Defaults to {}.
@@ -3763,7 +4095,7 @@ class Cluster:
             keep_timestamps (:obj:`bool`, optional): Replicate the timestamps of the source messages in the target messages. Defaults to True.
             n (:obj:`int`, optional): Number of messages to consume from the topic. Defaults to ALL_MESSAGES = -1.
             batch_size (:obj:`int`, optional): Maximum number of messages to consume from the topic at a time. Defaults to 1.
-            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 4096.
+            bufsize (:obj:`int`, optional): The buffer size for reading from the local file. Defaults to 1048576 (1 MiB).
 
         Returns:
             :obj:`tuple(int, int)`: Pair of the number of messages consumed from the source topic/read from the source local file and the number of messages produced to the target topic/written to the target local file.
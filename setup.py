@@ -22,6 +22,7 @@ setup(
                       'piny',
                       'requests'
                       ],
+    extras_require={'orjson': ['orjson']},
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
@@ -1,7 +1,17 @@
 #!/bin/bash
 if [ -z $1 ]
 then
-    coverage run -m unittest test_kash.Test
+    coverage run -m unittest test_kash
+elif [ $1 = "parallel" ]
+then
+    # The tests that change broker configurations (serial tests) are run after the others, one after another.
+    serial_tests="test_brokers or test_cluster_settings"
+    python -m pytest -n 8 -k "not ($serial_tests)" test_kash.py && python -m pytest -k "$serial_tests" test_kash.py
+    exit $?
+elif [[ $1 == *.* ]]
+then
+    # Test with class name, e.g. TestNoNetwork.test_errors
+    coverage run -m unittest test_kash.$1
 else
     coverage run -m unittest test_kash.Test.$1
 fi
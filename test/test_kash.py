@@ -1,8 +1,13 @@
 import filecmp
+import importlib.util
+import itertools
 import os
+import shutil
 import sys
+import tempfile
 import time
 import unittest
+import unittest.mock
 import warnings
 sys.path.insert(1, "..")
 from kashpy.kash import *
@@ -19,73 +24,193 @@ principal_str = None
 #cluster_str_without_kash = "ccloud_without_kash"
 #principal_str = "User:admin"
 
+# The tests produce only a few small messages at a time and then flush: wait only briefly for more messages to batch them (instead of the throughput-oriented kash.py producer defaults).
+test_producer_config_dict = {"linger.ms": 5, "batch.size": 65536, "compression.type": "lz4"}
+# Likewise, let the broker answer fetch requests for the few small test messages right away (instead of waiting to accumulate data).
+test_consumer_config_dict = {"fetch.wait.max.ms": 10, "fetch.min.bytes": 1}
+
 
 def count_lines(path_str):
-    def count_generator(reader):
-        bytes = reader(1024 * 1024)
-        while bytes:
-            yield bytes
-            bytes = reader(1024 * 1024)
-    #
-    with open(path_str, "rb") as bufferedReader:
-        c_generator = count_generator(bufferedReader.raw.read)
-        # count each \n
-        count_int = sum(buffer.count(b'\n') for buffer in c_generator)
+    buffer_bytearray = bytearray(1024 * 1024)
+    count_int = 0
+    with open(path_str, "rb", buffering=0) as fileIO:
+        # count each \n, reusing a single buffer for all reads
+        num_bytes_int = fileIO.readinto(buffer_bytearray)
+        while num_bytes_int:
+            count_int += buffer_bytearray.count(b'\n', 0, num_bytes_int)
+            num_bytes_int = fileIO.readinto(buffer_bytearray)
     #
     return count_int
 
 
+# Contents of the test files snacks_value.txt and snacks_key_value.txt (and of topics downloaded in the same format); snacks_value_no_newline.txt is snacks_value.txt without the final newline.
+# https://simon-aubury.medium.com/kafka-with-avro-vs-kafka-with-protobuf-vs-kafka-with-json-schema-667494cbb2af
+SNACKS_VALUE_BYTES = b'{"name": "cookie", "calories": 500.0, "colour": "brown"}\n{"name": "cake", "calories": 260.0, "colour": "white"}\n{"name": "timtam", "calories": 80.0, "colour": "chocolate"}\n'
+SNACKS_KEY_VALUE_BYTES = b'{"name": "cookie_key", "calories": 500.0, "colour": "brown"}/{"name": "cookie_value", "calories": 500.0, "colour": "brown"}\n{"name": "cake_key", "calories": 260.0, "colour": "white"}/{"name": "cake_value", "calories": 260.0, "colour": "white"}\n{"name": "timtam_key", "calories": 80.0, "colour": "chocolate"}/{"name": "timtam_value", "calories": 80.0, "colour": "chocolate"}\n'
+
+
+# Schemas of the snacks for the schema-based types.
+PB_SCHEMA_STR = 'message Snack { required string name = 1; required float calories = 2; optional string colour = 3; }'
+AVRO_SCHEMA_STR = '{ "type": "record", "name": "myrecord", "fields": [{"name": "name",  "type": "string" }, {"name": "calories", "type": "float" }, {"name": "colour", "type": "string" }] }'
+JSONSCHEMA_SCHEMA_STR = '{ "title": "abc", "definitions" : { "record:myrecord" : { "type" : "object", "required" : [ "name", "calories" ], "additionalProperties" : false, "properties" : { "name" : {"type" : "string"}, "calories" : {"type" : "number"}, "colour" : {"type" : "string"} } } }, "$ref" : "#/definitions/record:myrecord" }'
+
+
+# Consume n messages from a topic and return them in the same format as Cluster.cp() writes them to a local file (without going through a file). Keys and values of type "bytes" are taken as they are.
+def consume_to_bytes(cluster, topic_str, n, key_type="str", value_type="str", key_value_separator=None):
+    def payload_to_bytes(payload):
+        return payload if isinstance(payload, bytes) else payload_to_str(payload).encode("utf-8")
+
+    def foldl_function(line_bytes_list, message_dict):
+        if key_value_separator is None:
+            line_bytes_list.append(payload_to_bytes(message_dict["value"]))
+        else:
+            line_bytes_list.append(payload_to_bytes(message_dict["key"]) + key_value_separator.encode("utf-8") + payload_to_bytes(message_dict["value"]))
+        return line_bytes_list
+    #
+    (line_bytes_list, _) = cluster.foldl(topic_str, foldl_function, [], key_type=key_type, value_type=value_type, n=n, batch_size=n)
+    return b"".join(line_bytes + b"\n" for line_bytes in line_bytes_list)
+
+
+# Topic and group names include the process ID so that several test processes (e.g. pytest -n 8) can run against the same cluster at the same time, and the start time of the process so that they never clash with leftovers of earlier test runs. Within a process, they are numbered consecutively (two names created within the same millisecond must not be the same).
+test_run_str = f"{os.getpid()}_{get_millis()}"
+test_name_counter = itertools.count()
+
+
 def create_test_topic_name():
-    return f"test_topic_{get_millis()}"
+    return f"test_topic_{test_run_str}_{next(test_name_counter)}"
 
 
 def create_test_group_name():
-    return f"test_group_{get_millis()}"
+    return f"test_group_{test_run_str}_{next(test_name_counter)}"
+
+
+def wait_until(predicate_function, timeout=5.0, interval=0.02):
+    # Poll until the cluster has converged instead of sleeping for a fixed time
+    end_float = time.monotonic() + timeout
+    while not predicate_function():
+        if time.monotonic() >= end_float:
+            return False
+        time.sleep(interval)
+    return True
 
 class Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.old_home_str = os.environ.get("KASHPY_HOME")
+        os.environ["KASHPY_HOME"] = os.path.abspath("..")
+        # One cluster object (i.e. one set of connections to the cluster) shared by all tests; the tests use unique topic and group names.
+        cls.cluster = Cluster(cluster_str, producer_config=test_producer_config_dict, consumer_config=test_consumer_config_dict)
+        cls.cluster.session_timeout_ms(6000)
+        # Create a (single-partition) topic for each test of this class up front, with a single request, and wait for all of them at once instead of creating and waiting for them one after another in the individual tests. The names are derived from the test names, i.e. there is no count to keep in sync with the tests.
+        cls.test_name_str_topic_str_dict = {test_name_str: create_test_topic_name() for test_name_str in unittest.TestLoader().getTestCaseNames(cls)}
+        precreated_topic_str_set = set(cls.cluster.create_many([{"topic": topic_str} for topic_str in cls.test_name_str_topic_str_dict.values()], block=False))
+        wait_until(lambda: precreated_topic_str_set.issubset(cls.cluster.ls(f"test_topic_{test_run_str}_*")), timeout=30.0)
+        # Write the test files only once, into a directory of their own (i.e. not shared with other test processes). Prefer the RAM-backed /dev/shm (if available, e.g. on Linux) over the default temporary directory, which may be on disk.
+        tmp_parent_dir_str = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+        cls.tmp_dir_str = tempfile.mkdtemp(prefix="kashpy_test_", dir=tmp_parent_dir_str)
+        cls.SNACKS_VALUE_PATH = os.path.join(cls.tmp_dir_str, "snacks_value.txt")
+        cls.SNACKS_VALUE_NO_NEWLINE_PATH = os.path.join(cls.tmp_dir_str, "snacks_value_no_newline.txt")
+        cls.SNACKS_KEY_VALUE_PATH = os.path.join(cls.tmp_dir_str, "snacks_key_value.txt")
+        # Paths of the files the tests download topics to.
+        cls.SNACKS_VALUE1_PATH = os.path.join(cls.tmp_dir_str, "snacks_value1.txt")
+        cls.SNACKS_VALUE2_PATH = os.path.join(cls.tmp_dir_str, "snacks_value2.txt")
+        cls.SNACKS_KEY_VALUE1_PATH = os.path.join(cls.tmp_dir_str, "snacks_key_value1.txt")
+        with open(cls.SNACKS_VALUE_PATH, "wb") as bufferedWriter:
+            bufferedWriter.write(SNACKS_VALUE_BYTES)
+        with open(cls.SNACKS_VALUE_NO_NEWLINE_PATH, "wb") as bufferedWriter:
+            bufferedWriter.write(SNACKS_VALUE_BYTES.rstrip(b"\n"))
+        with open(cls.SNACKS_KEY_VALUE_PATH, "wb") as bufferedWriter:
+            bufferedWriter.write(SNACKS_KEY_VALUE_BYTES)
+
+    @classmethod
+    def tearDownClass(cls):
+        # Delete all the topics created by the tests (of this process) at once instead of one after another at the end of each test.
+        cls.cluster.delete(f"test_topic_{test_run_str}_*", block=False)
+        #
+        shutil.rmtree(cls.tmp_dir_str)
+        #
+        if cls.old_home_str is None:
+            os.environ.pop("KASHPY_HOME", None)
+        else:
+            os.environ["KASHPY_HOME"] = cls.old_home_str
+
+    def create_test_topic(self):
+        # Take the topic created for the calling test in setUpClass, or create a new one if it has already been taken (for tests which need more than one topic).
+        topic_str = self.test_name_str_topic_str_dict.pop(self._testMethodName, None)
+        if topic_str is not None:
+            return topic_str
+        topic_str = create_test_topic_name()
+        self.cluster.create(topic_str)
+        return topic_str
+
     def setUp(self):
         warnings.filterwarnings(action="ignore", message="unclosed", category=ResourceWarning)
         #
-        self.old_home_str = os.environ.get("KASHPY_HOME")
-        os.environ["KASHPY_HOME"] = ".."
-        # https://simon-aubury.medium.com/kafka-with-avro-vs-kafka-with-protobuf-vs-kafka-with-json-schema-667494cbb2af
-        with open("./snacks_value.txt", "w") as textIOWrapper:
-            textIOWrapper.writelines(['{"name": "cookie", "calories": 500.0, "colour": "brown"}\n', '{"name": "cake", "calories": 260.0, "colour": "white"}\n', '{"name": "timtam", "calories": 80.0, "colour": "chocolate"}\n'])
-        with open("./snacks_value_no_newline.txt", "w") as textIOWrapper:
-            textIOWrapper.writelines(['{"name": "cookie", "calories": 500.0, "colour": "brown"}\n', '{"name": "cake", "calories": 260.0, "colour": "white"}\n', '{"name": "timtam", "calories": 80.0, "colour": "chocolate"}'])
-        with open("./snacks_key_value.txt", "w") as textIOWrapper:
-            textIOWrapper.writelines(['{"name": "cookie_key", "calories": 500.0, "colour": "brown"}/{"name": "cookie_value", "calories": 500.0, "colour": "brown"}\n', '{"name": "cake_key", "calories": 260.0, "colour": "white"}/{"name": "cake_value", "calories": 260.0, "colour": "white"}\n', '{"name": "timtam_key", "calories": 80.0, "colour": "chocolate"}/{"name": "timtam_value", "calories": 80.0, "colour": "chocolate"}\n'])
-        #
         print("Test:", self._testMethodName)
-
-    def tearDown(self):
-        if self.old_home_str:
-            os.environ["KASHPY_HOME"] = self.old_home_str
-        #
-        os.remove("./snacks_value.txt")
-        os.remove("./snacks_value_no_newline.txt")
-        os.remove("./snacks_key_value.txt")
     
-    def test_create(self):
-        cluster = Cluster(cluster_str)
+    def test_topic_lifecycle(self):
+        # Create one topic and check its existence, description and partitions, instead of creating a topic for each of these checks.
+        cluster = self.cluster
         topic_str = create_test_topic_name()
+        self.assertFalse(cluster.exists(topic_str))
         cluster.create(topic_str)
         topic_str_list = cluster.ls()
         self.assertIn(topic_str, topic_str_list)
+        self.assertTrue(cluster.exists(topic_str))
+        #
+        topic_dict = cluster.describe(topic_str)[topic_str]
+        self.assertEqual(topic_dict["topic"], topic_str)
+        self.assertEqual(topic_dict["partitions"][0]["id"], 0)
+        #
+        num_partitions_int_1 = cluster.partitions(topic_str)[topic_str]
+        self.assertEqual(num_partitions_int_1, 1)
+        cluster.set_partitions(topic_str, 2)
+        wait_until(lambda: cluster.partitions(topic_str)[topic_str] == 2)
+        num_partitions_int_2 = cluster.partitions(topic_str)[topic_str]
+        self.assertEqual(num_partitions_int_2, 2)
+        #
+        cluster.delete(topic_str)
+        self.assertNotIn(topic_str, cluster.ls())
+
+    def test_metadata_cache(self):
+        # A cluster object of its own with the (by default disabled) topic metadata cache enabled; create(), set_partitions() and delete() must invalidate it.
+        cluster = Cluster(cluster_str, producer_config=test_producer_config_dict, consumer_config=test_consumer_config_dict)
+        cluster.metadata_cache_ttl(60.0)
+        topic_str = create_test_topic_name()
+        self.assertNotIn(topic_str, cluster.ls())
+        #
+        cluster.create(topic_str)
+        self.assertIn(topic_str, cluster.ls())
+        self.assertTrue(cluster.exists(topic_str))
+        #
+        cluster.set_partitions(topic_str, 2)
+        self.assertFalse(cluster.topic_metadata_cache_is_valid())
+        #
         cluster.delete(topic_str)
+        self.assertNotIn(topic_str, cluster.ls())
+        self.assertFalse(cluster.exists(topic_str))
+
+    def test_create_many(self):
+        cluster = self.cluster
+        topic_str1 = create_test_topic_name()
+        topic_str2 = create_test_topic_name()
+        topic_str_list = cluster.create_many([{"topic": topic_str1}, {"topic": topic_str2, "partitions": 2, "config": {"retention.ms": "4711"}}])
+        self.assertEqual(topic_str_list, [topic_str1, topic_str2])
+        #
+        self.assertEqual(cluster.partitions([topic_str1, topic_str2]), {topic_str1: 1, topic_str2: 2})
+        topic_str_config_dict_dict = cluster.config([topic_str1, topic_str2])
+        self.assertEqual(topic_str_config_dict_dict[topic_str1]["retention.ms"], str(cluster.retention_ms()))
+        self.assertEqual(topic_str_config_dict_dict[topic_str2]["retention.ms"], "4711")
 
     def test_topics(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         topic_str = create_test_topic_name()
         old_topic_str_list = cluster.topics(["test_*"])
         self.assertNotIn(topic_str, old_topic_str_list)
         cluster.create(topic_str)
         new_topic_str_list = cluster.ls(["test_*"])
         self.assertIn(topic_str, new_topic_str_list)
-        cluster.produce(topic_str, "message 1", on_delivery=lambda kafkaError, message: print(kafkaError, message))
-        cluster.produce(topic_str, "message 2")
-        cluster.produce(topic_str, "message 3")
-        cluster.flush()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"], on_delivery=lambda kafkaError, message: print(kafkaError, message))
         topic_str_size_int_dict_l = cluster.l(pattern=topic_str)
         topic_str_size_int_dict_ll = cluster.ll(pattern=topic_str)
         self.assertEqual(topic_str_size_int_dict_l, topic_str_size_int_dict_ll)
@@ -96,56 +221,25 @@ class Test(unittest.TestCase):
         self.assertEqual(topic_str_total_size_int_size_dict_tuple_dict[topic_str][1][0], 3)
         topic_str_total_size_int_size_dict_tuple_dict = cluster.topics(pattern=topic_str, size=False, partitions=True)
         self.assertEqual(topic_str_total_size_int_size_dict_tuple_dict[topic_str][0], 3)
-        cluster.delete(topic_str)
 
     def test_config(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         cluster.set_config(topic_str, "retention.ms", 4711)
+        wait_until(lambda: cluster.config(topic_str)[topic_str]["retention.ms"] == "4711")
         new_retention_ms_str = cluster.config(topic_str)[topic_str]["retention.ms"]
         self.assertEqual(new_retention_ms_str, "4711")
         cluster.rm(topic_str)
 
-    def test_describe(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        topic_dict = cluster.describe(topic_str)[topic_str]
-        self.assertEqual(topic_dict["topic"], topic_str)
-        self.assertEqual(topic_dict["partitions"][0]["id"], 0)
-        cluster.delete(topic_str)
-
-    def test_exists(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        self.assertFalse(cluster.exists(topic_str))
-        cluster.create(topic_str)
-        self.assertTrue(cluster.exists(topic_str))
-        cluster.delete(topic_str)
-
-    def test_partitions(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        num_partitions_int_1 = cluster.partitions(topic_str)[topic_str]
-        self.assertEqual(num_partitions_int_1, 1)
-        cluster.set_partitions(topic_str, 2)
-        num_partitions_int_2 = cluster.partitions(topic_str)[topic_str]
-        self.assertEqual(num_partitions_int_2, 2)
-        cluster.delete(topic_str)
-
     def test_groups(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.produce(topic_str, "message 1")
-        cluster.produce(topic_str, "message 2")
-        cluster.produce(topic_str, "message 3")
-        cluster.flush()
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"])
         group_str = create_test_group_name()
         cluster.subscribe(topic_str, group_str)
-        cluster.consume()
+        cluster.consume(n=3, timeout=2.0)
+        # Wait until the consumer has joined the group (instead of assuming it is stable right after the first messages have been consumed).
+        wait_until(lambda: cluster.groups(group_str, state_patterns=["stable"]) == [group_str])
         #
         group_str_list1 = cluster.groups(["test*", "test_group*"])
         self.assertIn(group_str, group_str_list1)
@@ -159,19 +253,16 @@ class Test(unittest.TestCase):
         self.assertEqual(group_str_list4, [])
         #
         cluster.close()
-        cluster.delete(topic_str)
 
     def test_describe_groups(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.produce(topic_str, "message 1")
-        cluster.produce(topic_str, "message 2")
-        cluster.produce(topic_str, "message 3")
-        cluster.flush()
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"])
         group_str = create_test_group_name()
         cluster.subscribe(topic_str, group_str)
-        cluster.consume()
+        cluster.consume(n=3, timeout=2.0)
+        # Wait until the consumer has joined the group (instead of assuming it is stable right after the first messages have been consumed).
+        wait_until(lambda: cluster.groups(group_str, state_patterns=["stable"]) == [group_str])
         #
         group_dict = cluster.describe_groups(group_str)[group_str]
         self.assertEqual(group_dict["group_id"], group_str)
@@ -189,16 +280,11 @@ class Test(unittest.TestCase):
         self.assertEqual(group_dict["coordinator"]["id_string"], "0")
         #
         cluster.close()
-        cluster.delete(topic_str)
 
     def test_delete_groups(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.produce(topic_str, "message 1")
-        cluster.produce(topic_str, "message 2")
-        cluster.produce(topic_str, "message 3")
-        cluster.flush()
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"])
         group_str = create_test_group_name()
         cluster.subscribe(topic_str, group_str)
         cluster.consume()
@@ -209,10 +295,9 @@ class Test(unittest.TestCase):
         self.assertEqual(group_str_list, [group_str])
         #
         cluster.close()
-        cluster.delete(topic_str)
 
     def test_group_offsets(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         topic_str = create_test_topic_name()
         cluster.create(topic_str, partitions=2)
         cluster.produce(topic_str, "message 1", partition=0)
@@ -232,10 +317,9 @@ class Test(unittest.TestCase):
         self.assertEqual(group_str_topic_str_partition_int_offset_int_dict_dict_dict[group_str][topic_str][1], 1)
         #
         cluster.close()
-        cluster.delete(topic_str)
 
     def test_group_offsets(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         topic_str = create_test_topic_name()
         cluster.create(topic_str, partitions=2)
         cluster.produce(topic_str, "message 1", partition=0)
@@ -255,17 +339,12 @@ class Test(unittest.TestCase):
         self.assertEqual(group_str_topic_str_partition_int_offset_int_dict_dict_dict[group_str][topic_str][1], 1)
         #
         cluster.close()
-        cluster.delete(topic_str)
 
     def test_alter_group_offsets(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         #
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.produce(topic_str, "message 1")
-        cluster.produce(topic_str, "message 2")
-        cluster.produce(topic_str, "message 3")
-        cluster.flush()
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"])
         #
         group_str = create_test_group_name()
         #
@@ -280,10 +359,9 @@ class Test(unittest.TestCase):
         cluster.unsubscribe()
         #
         cluster.close()
-        cluster.delete(topic_str)
 
     def test_brokers(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         if "confluent.cloud" not in cluster.config_dict["bootstrap.servers"]:
             broker_dict = cluster.brokers()
             broker_dict1 = cluster.brokers("0")
@@ -299,212 +377,141 @@ class Test(unittest.TestCase):
 
     def test_acls(self):
         if principal_str:
-            cluster = Cluster(cluster_str)
-            topic_str = create_test_topic_name()
-            cluster.create(topic_str)
+            cluster = self.cluster
+            topic_str = self.create_test_topic()
             cluster.create_acl(restype="topic", name=topic_str, resource_pattern_type="literal", principal=principal_str, host="*", operation="read", permission_type="allow")
+            wait_until(lambda: any(acl_dict["name"] == topic_str for acl_dict in cluster.acls()))
             acl_dict_list = cluster.acls()
             self.assertIn({"restype": "topic", "name": topic_str, "resource_pattern_type": "literal", 'principal': principal_str, 'host': '*', 'operation': 'read', 'permission_type': 'allow'}, acl_dict_list)
             cluster.delete_acl(restype="topic", name=topic_str, resource_pattern_type="literal", principal=principal_str, host="*", operation="read", permission_type="allow")
             self.assertIn({"restype": "topic", "name": topic_str, "resource_pattern_type": "literal", 'principal': principal_str, 'host': '*', 'operation': 'read', 'permission_type': 'allow'}, acl_dict_list)
-            cluster.delete(topic_str)
     
     def test_produce_consume_bytes(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="bytes")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-        cluster.cp(topic_str, "./snacks_value1.txt", source_value_type="str", batch_size=3, n=3)
-        self.assertTrue(filecmp.cmp("./snacks_value.txt", "./snacks_value1.txt"))
-        os.remove("./snacks_value1.txt")
-        cluster.delete(topic_str)
+        self.assertEqual(consume_to_bytes(cluster, topic_str, 3, value_type="bytes"), SNACKS_VALUE_BYTES)
         #
-        topic_str_key_value = create_test_topic_name()
-        cluster.create(topic_str_key_value)
-        cluster.cp("./snacks_key_value.txt", topic_str_key_value, target_key_type="str", target_value_type="str", key_value_separator="/")
+        topic_str_key_value = self.create_test_topic()
+        cluster.cp(self.SNACKS_KEY_VALUE_PATH, topic_str_key_value, target_key_type="bytes", target_value_type="bytes", key_value_separator="/")
         self.assertEqual(cluster.size(topic_str_key_value)[topic_str_key_value][0], 3)
-        cluster.cp(topic_str_key_value, "./snacks_key_value1.txt", source_key_type="str", source_value_type="str", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value1.txt"))
-        os.remove("./snacks_key_value1.txt")
-        cluster.delete(topic_str_key_value)
+        self.assertEqual(consume_to_bytes(cluster, topic_str_key_value, 3, key_type="bytes", value_type="bytes", key_value_separator="/"), SNACKS_KEY_VALUE_BYTES)
 
     def test_produce_consume_string(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value_no_newline.txt", topic_str, target_value_type="str", bufsize=150)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_NO_NEWLINE_PATH, topic_str, target_value_type="str", bufsize=150)
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-        cluster.cp(topic_str, "./snacks_value1.txt", source_value_type="str", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_value.txt", "./snacks_value1.txt"))
-        os.remove("./snacks_value1.txt")
-        cluster.delete(topic_str)
+        (message_counter_int, line_counter_int) = cluster.cp(topic_str, self.SNACKS_VALUE1_PATH, source_value_type="str", n=3)
+        self.assertEqual(message_counter_int, 3)
+        self.assertEqual(line_counter_int, 3)
+        self.assertTrue(filecmp.cmp(self.SNACKS_VALUE_PATH, self.SNACKS_VALUE1_PATH))
+        os.remove(self.SNACKS_VALUE1_PATH)
         #
-        topic_str_key_value = create_test_topic_name()
-        cluster.create(topic_str_key_value)
-        cluster.cp("./snacks_key_value.txt", topic_str_key_value, target_key_type="str", target_value_type="str", key_value_separator="/")
+        topic_str_key_value = self.create_test_topic()
+        cluster.cp(self.SNACKS_KEY_VALUE_PATH, topic_str_key_value, target_key_type="str", target_value_type="str", key_value_separator="/")
         self.assertEqual(cluster.size(topic_str_key_value)[topic_str_key_value][0], 3)
-        cluster.cp(topic_str_key_value, "./snacks_key_value1.txt", source_key_type="str", source_value_type="str", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value1.txt"))
-        os.remove("./snacks_key_value1.txt")
-        cluster.delete(topic_str_key_value)
+        cluster.cp(topic_str_key_value, self.SNACKS_KEY_VALUE1_PATH, source_key_type="str", source_value_type="str", key_value_separator="/", n=3)
+        self.assertTrue(filecmp.cmp(self.SNACKS_KEY_VALUE_PATH, self.SNACKS_KEY_VALUE1_PATH))
+        os.remove(self.SNACKS_KEY_VALUE1_PATH)
     
     def test_produce_consume_json(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="json")
-        self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-        cluster.cp(topic_str, "./snacks_value1.txt", source_value_type="json", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_value.txt", "./snacks_value1.txt"))
-        os.remove("./snacks_value1.txt")
-        cluster.delete(topic_str)
-        #
-        topic_str_key_value = create_test_topic_name()
-        cluster.create(topic_str_key_value)
-        cluster.cp("./snacks_key_value.txt", topic_str_key_value, target_key_type="json", target_value_type="json", key_value_separator="/")
-        self.assertEqual(cluster.size(topic_str_key_value)[topic_str_key_value][0], 3)
-        cluster.cp(topic_str_key_value, "./snacks_key_value1.txt", source_key_type="json", source_value_type="json", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value1.txt"))
-        os.remove("./snacks_key_value1.txt")
-        cluster.delete(topic_str_key_value)
+        self.check_produce_consume("json")
 
     def test_produce_consume_protobuf(self):
-        schema_str = 'message Snack { required string name = 1; required float calories = 2; optional string colour = 3; }'
-        #
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="pb", target_value_schema=schema_str)
-        self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-        cluster.cp(topic_str, "./snacks_value1.txt", source_value_type="pb", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_value.txt", "./snacks_value1.txt"))
-        os.remove("./snacks_value1.txt")
-        cluster.delete(topic_str)
-        #
-        topic_str_key_value = create_test_topic_name()
-        cluster.create(topic_str_key_value)
-        cluster.cp("./snacks_key_value.txt", topic_str_key_value, target_key_type="pb", target_value_type="pb", target_key_schema=schema_str, target_value_schema=schema_str, key_value_separator="/")
-        self.assertEqual(cluster.size(topic_str_key_value)[topic_str_key_value][0], 3)
-        cluster.cp(topic_str_key_value, "./snacks_key_value1.txt", source_key_type="pb", source_value_type="pb", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value1.txt"))
-        os.remove("./snacks_key_value1.txt")
+        cluster = self.cluster
+        topic_str_key_value = self.check_produce_consume("pb", PB_SCHEMA_STR)
         #
         cluster.create(f"{topic_str_key_value}_1")
         cp(cluster, topic_str_key_value, cluster, f"{topic_str_key_value}_1", keep_timestamps=False)
-        cluster.cp(f"{topic_str_key_value}_1", "./snacks_key_value2.txt", source_key_type="pb", source_value_type="pb", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value2.txt"))
-        os.remove("./snacks_key_value2.txt")
-        cluster.delete(topic_str_key_value)
-        cluster.delete(f"{topic_str_key_value}_1")
+        self.assertEqual(consume_to_bytes(cluster, f"{topic_str_key_value}_1", 3, key_type="pb", value_type="pb", key_value_separator="/"), SNACKS_KEY_VALUE_BYTES)
 
     def test_produce_consume_avro(self):
-        schema_str = '{ "type": "record", "name": "myrecord", "fields": [{"name": "name",  "type": "string" }, {"name": "calories", "type": "float" }, {"name": "colour", "type": "string" }] }'
-        #
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        (num_lines_int, num_messages_int) = cluster.cp("./snacks_value.txt", topic_str, target_value_type="avro", target_value_schema=schema_str)
-        self.assertEqual(num_lines_int, 3)
-        self.assertEqual(num_messages_int, 3)
-        self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-        (message_counter_int, line_counter_int) = cluster.cp(topic_str, "./snacks_value1.txt", source_value_type="avro", n=3)
-        self.assertEqual(message_counter_int, 3)
-        self.assertEqual(line_counter_int, 3)
-        self.assertTrue(filecmp.cmp("./snacks_value.txt", "./snacks_value1.txt"))
-        os.remove("./snacks_value1.txt")
-        cluster.delete(topic_str)
-        #
-        topic_str_key_value = create_test_topic_name()
-        cluster.create(topic_str_key_value)
-        cluster.cp("./snacks_key_value.txt", topic_str_key_value, target_key_type="avro", target_value_type="avro", target_key_schema=schema_str, target_value_schema=schema_str, key_value_separator="/")
-        self.assertEqual(cluster.size(topic_str_key_value)[topic_str_key_value][0], 3)
-        cluster.cp(topic_str_key_value, "./snacks_key_value1.txt", source_key_type="avro", source_value_type="avro", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value1.txt"))
-        os.remove("./snacks_key_value1.txt")
+        cluster = self.cluster
+        topic_str_key_value = self.check_produce_consume("avro", AVRO_SCHEMA_STR)
         #
         cluster.create(f"{topic_str_key_value}_1")
         (consumed_message_counter_int, produced_message_counter_int) = cp(cluster, topic_str_key_value, cluster, f"{topic_str_key_value}_1")
         self.assertEqual(consumed_message_counter_int, 3)
         self.assertEqual(produced_message_counter_int, 3)
-        cluster.cp(f"{topic_str_key_value}_1", "./snacks_key_value2.txt", source_key_type="avro", source_value_type="avro", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value2.txt"))
-        os.remove("./snacks_key_value2.txt")
-        cluster.delete(topic_str_key_value)
-        cluster.delete(f"{topic_str_key_value}_1")
+        self.assertEqual(consume_to_bytes(cluster, f"{topic_str_key_value}_1", 3, key_type="avro", value_type="avro", key_value_separator="/"), SNACKS_KEY_VALUE_BYTES)
 
     def test_produce_consume_jsonschema(self):
-        schema_str = '{ "title": "abc", "definitions" : { "record:myrecord" : { "type" : "object", "required" : [ "name", "calories" ], "additionalProperties" : false, "properties" : { "name" : {"type" : "string"}, "calories" : {"type" : "number"}, "colour" : {"type" : "string"} } } }, "$ref" : "#/definitions/record:myrecord" }'
-        #
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="jsonschema", target_value_schema=schema_str)
+        self.check_produce_consume("jsonschema", JSONSCHEMA_SCHEMA_STR)
+
+    # Shared by the produce/consume tests for JSON and the schema-based types: upload the snacks without and with keys and check what is consumed from the topics. Returns the topic with the keys and values for further checks.
+    def check_produce_consume(self, type_str, schema_str=None):
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        (num_lines_int, num_messages_int) = cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type=type_str, target_value_schema=schema_str)
+        self.assertEqual(num_lines_int, 3)
+        self.assertEqual(num_messages_int, 3)
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-        cluster.cp(topic_str, "./snacks_value1.txt", source_value_type="jsonschema", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_value.txt", "./snacks_value1.txt"))
-        os.remove("./snacks_value1.txt")
-        cluster.delete(topic_str)
+        self.assertEqual(consume_to_bytes(cluster, topic_str, 3, value_type=type_str), SNACKS_VALUE_BYTES)
         #
-        topic_str_key_value = create_test_topic_name()
-        cluster.create(topic_str_key_value)
-        cluster.cp("./snacks_key_value.txt", topic_str_key_value, target_key_type="jsonschema", target_value_type="jsonschema", target_key_schema=schema_str, target_value_schema=schema_str, key_value_separator="/")
+        topic_str_key_value = self.create_test_topic()
+        cluster.cp(self.SNACKS_KEY_VALUE_PATH, topic_str_key_value, target_key_type=type_str, target_value_type=type_str, target_key_schema=schema_str, target_value_schema=schema_str, key_value_separator="/")
         self.assertEqual(cluster.size(topic_str_key_value)[topic_str_key_value][0], 3)
-        cluster.cp(topic_str_key_value, "./snacks_key_value1.txt", source_key_type="jsonschema", source_value_type="jsonschema", key_value_separator="/", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_key_value.txt", "./snacks_key_value1.txt"))
-        os.remove("./snacks_key_value1.txt")
-        cluster.delete(topic_str_key_value)
+        self.assertEqual(consume_to_bytes(cluster, topic_str_key_value, 3, key_type=type_str, value_type=type_str, key_value_separator="/"), SNACKS_KEY_VALUE_BYTES)
+        return topic_str_key_value
+
+    def test_produce_list(self):
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"], key_list=["key 1", "key 2", "key 3"])
+        # produce_list() flushes, i.e. all the messages have been delivered when it returns.
+        self.assertEqual(cluster.l(topic_str)[topic_str], 3)
+        self.assertEqual(consume_to_bytes(cluster, topic_str, 3, key_value_separator="/"), b"key 1/message 1\nkey 2/message 2\nkey 3/message 3\n")
+
+    def test_serializer_cache(self):
+        # Use a fresh cluster object whose serializer cache is still empty.
+        cluster = Cluster(cluster_str, producer_config=test_producer_config_dict)
+        topic_str = self.create_test_topic()
+        cluster.create(f"{topic_str}_1")
+        with unittest.mock.patch("kashpy.kash.AvroSerializer", wraps=AvroSerializer) as avroSerializer_mock:
+            cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="avro", target_value_schema=AVRO_SCHEMA_STR)
+            cluster.cp(self.SNACKS_VALUE_PATH, f"{topic_str}_1", target_value_type="avro", target_value_schema=AVRO_SCHEMA_STR)
+        # The schema is only parsed once for both topics.
+        self.assertEqual(avroSerializer_mock.call_count, 1)
+        self.assertEqual(consume_to_bytes(cluster, f"{topic_str}_1", 3, value_type="avro"), SNACKS_VALUE_BYTES)
 
     def test_offsets(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.produce(topic_str, "message 1")
-        cluster.produce(topic_str, "message 2")
-        cluster.produce(topic_str, "message 3")
-        cluster.flush()
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"])
         cluster.cat(topic_str)
         cluster.subscribe(topic_str, offsets={0: 2})
-        message_dict_list = cluster.consume()
+        message_dict_list = cluster.consume(n=1, timeout=2.0)
         self.assertEqual(len(message_dict_list), 1)
         self.assertEqual(message_dict_list[0]["value"], "message 3")
         cluster.close()
-        cluster.delete(topic_str)
 
     def test_commit(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.produce(topic_str, "message 1")
-        cluster.produce(topic_str, "message 2")
-        cluster.produce(topic_str, "message 3")
-        cluster.flush()
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"])
         cluster.cat(topic_str, n=3)
         cluster.subscribe(topic_str, config={"enable.auto.commit": "False"})
-        cluster.consume()
+        cluster.consume(n=3, timeout=2.0)
         offsets_dict = cluster.offsets()
         self.assertEqual(offsets_dict[0], "OFFSET_INVALID")
         cluster.commit()
+        wait_until(lambda: cluster.offsets()[0] == 3)
         offsets_dict1 = cluster.offsets()
-        self.assertEqual(offsets_dict1[0], 1)
+        self.assertEqual(offsets_dict1[0], 3)
         cluster.close()
-        cluster.delete(topic_str)
 
-    def test_errors(self):
-        cluster = Cluster(cluster_str)
-        cluster.cp("./abc", "./abc")
-        cluster.consume("abc")
-    
     def test_cluster_settings(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         cluster.verbose(0)
         self.assertEqual(cluster.verbose(), 0)
 
     def test_transforms_string(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         topic_str = create_test_topic_name()
         cluster.touch(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def map_function(message_dict):
@@ -521,39 +528,15 @@ class Test(unittest.TestCase):
         message_dict_list = cluster.consume(n=2)
         for message_dict in message_dict_list:
             value_dict = json.loads(message_dict["value"])            
-            self.assertRegex(value_dict["colour"], ".*ish")
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
+            self.assertTrue(value_dict["colour"].endswith("ish"))
 
     def test_transforms_json(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="json", n=2)
-        self.assertEqual(cluster.size(topic_str)[topic_str][0], 2)
-        #
-        def map_function(message_dict):
-            message_dict["value"]["colour"] += "ish"
-            return message_dict
-        cluster.create(f"{topic_str}_1")
-        map(cluster, topic_str, cluster, f"{topic_str}_1", map_function, source_value_type="json", n=3)
-        #
-        cluster.subscribe(f"{topic_str}_1", value_type="json")
-        message_dict_list = cluster.consume(n=2)
-        for message_dict in message_dict_list:
-            self.assertRegex(message_dict["value"]["colour"], ".*ish")
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
+        self.check_transforms_dict("json")
 
     def test_transforms_protobuf(self):
-        schema_str = 'message Snack { required string name = 1; required float calories = 2; optional string colour = 3; }'
-        #
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_key_value.txt", topic_str, target_key_type="pb", target_value_type="pb", target_key_schema=schema_str, target_value_schema=schema_str, key_value_separator="/")
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_KEY_VALUE_PATH, topic_str, target_key_type="pb", target_value_type="pb", target_key_schema=PB_SCHEMA_STR, target_value_schema=PB_SCHEMA_STR, key_value_separator="/")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def map_function(message_dict):
@@ -566,63 +549,38 @@ class Test(unittest.TestCase):
         cluster.subscribe(f"{topic_str}_1", key_type="pb", value_type="pb")
         message_dict_list = cluster.consume(n=3)
         for message_dict in message_dict_list:
-            self.assertRegex(message_dict["key"]["colour"], ".*ishy")
-            self.assertRegex(message_dict["value"]["colour"], ".*ish")
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
+            self.assertTrue(message_dict["key"]["colour"].endswith("ishy"))
+            self.assertTrue(message_dict["value"]["colour"].endswith("ish"))
 
     def test_transforms_avro(self):
-        schema_str = '{ "type": "record", "name": "myrecord", "fields": [{"name": "name",  "type": "string" }, {"name": "calories", "type": "float" }, {"name": "colour", "type": "string" }] }'
-        #
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="avro", target_value_schema=schema_str)
-        self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-        #
-        def map_function(message_dict):
-            message_dict["value"]["colour"] += "ish"
-            return message_dict
-        cluster.create(f"{topic_str}_1")
-        map(cluster, topic_str, cluster, f"{topic_str}_1", map_function, source_value_type="avro", n=3)
-        #
-        cluster.subscribe(f"{topic_str}_1", value_type="avro")
-        message_dict_list = cluster.consume(n=3)
-        for message_dict in message_dict_list:
-            self.assertRegex(message_dict["value"]["colour"], ".*ish")
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
+        self.check_transforms_dict("avro", AVRO_SCHEMA_STR)
 
     def test_transforms_jsonschema(self):
-        schema_str = '{ "title": "abc", "definitions" : { "record:myrecord" : { "type" : "object", "required" : [ "name", "calories" ], "additionalProperties" : false, "properties" : { "name" : {"type" : "string"}, "calories" : {"type" : "number"}, "colour" : {"type" : "string"} } } }, "$ref" : "#/definitions/record:myrecord" }'
-        #
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="jsonschema", target_value_schema=schema_str)
+        self.check_transforms_dict("jsonschema", JSONSCHEMA_SCHEMA_STR)
+
+    # Shared by the transform tests for the value types which are consumed as dictionaries (JSON and the schema-based types): upload the snacks, map their colours to "...ish" into a second topic and check the result.
+    def check_transforms_dict(self, value_type_str, schema_str=None):
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type=value_type_str, target_value_schema=schema_str)
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def map_function(message_dict):
             message_dict["value"]["colour"] += "ish"
             return message_dict
         cluster.create(f"{topic_str}_1")
-        map(cluster, topic_str, cluster, f"{topic_str}_1", map_function, source_value_type="jsonschema", n=3)
+        map(cluster, topic_str, cluster, f"{topic_str}_1", map_function, source_value_type=value_type_str, n=3)
         #
-        cluster.subscribe(f"{topic_str}_1", value_type="jsonschema")
+        cluster.subscribe(f"{topic_str}_1", value_type=value_type_str)
         message_dict_list = cluster.consume(n=3)
+        self.assertEqual(len(message_dict_list), 3)
         for message_dict in message_dict_list:
-            self.assertRegex(message_dict["value"]["colour"], ".*ish")
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
+            self.assertTrue(message_dict["value"]["colour"].endswith("ish"))
 
     def test_transforms_bytes(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def flatmap_function(message_dict):
@@ -638,18 +596,12 @@ class Test(unittest.TestCase):
         for message_dict in message_dict_list:            
             value_bytes = message_dict["value"]
             self.assertEqual(value_bytes[10], ord("X"))     
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
 
     def test_grep(self):
-        schema_str = '{ "type": "record", "name": "myrecord", "fields": [{"name": "name",  "type": "string" }, {"name": "calories", "type": "float" }, {"name": "colour", "type": "string" }] }'
-        #
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         cluster.verbose(1)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="avro", target_value_schema=schema_str)
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="avro", target_value_schema=AVRO_SCHEMA_STR)
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         (message_dict_list, num_matching_messages_int, message_counter_int) = cluster.grep(topic_str, ".*name.*cake", value_type="avro")
@@ -661,16 +613,15 @@ class Test(unittest.TestCase):
         self.assertEqual(len(message_dict_list), 0)
         self.assertEqual(num_matching_messages_int, 0)
         self.assertEqual(message_counter_int, 1)
-        #
-        cluster.delete(topic_str)
 
     def test_offsets_for_times(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         cluster.verbose(1)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        topic_str = self.create_test_topic()
         cluster.produce(topic_str, "message 1")
-        time.sleep(1)
+        # The second message only needs a later (millisecond) timestamp than the first one
+        millis_int = get_millis()
+        wait_until(lambda: get_millis() > millis_int)
         cluster.produce(topic_str, "message 2")
         cluster.flush()
         self.assertEqual(cluster.l(topic_str, partitions=True)[topic_str][1][0], 2)
@@ -683,58 +634,63 @@ class Test(unittest.TestCase):
         topic_str_partition_int_offset_int_dict_dict = cluster.offsets_for_times(topic_str, {0: message1_timestamp_int})
         found_message1_offset_int = topic_str_partition_int_offset_int_dict_dict[topic_str][0]
         self.assertEqual(message1_offset_int, found_message1_offset_int)
+
+    def test_offsets_for_times_multi(self):
+        cluster = self.cluster
+        topic_str1 = self.create_test_topic()
+        topic_str2 = self.create_test_topic()
+        cluster.produce_list(topic_str1, ["message 1", "message 2"])
+        cluster.produce_list(topic_str2, ["message 3"])
         #
-        cluster.delete(topic_str)
+        cluster.subscribe(topic_str1)
+        message_dict_list = cluster.consume(n=2)
+        cluster.close()
+        message_timestamp_int = message_dict_list[-1]["timestamp"][1]
+        #
+        # Looking up several topics at once must give the same offsets as looking them up one after another.
+        topic_str_partition_int_timestamp_int_dict_dict = {topic_str1: {0: message_timestamp_int}, topic_str2: {0: 0}}
+        topic_str_partition_int_offset_int_dict_dict = cluster.offsets_for_times_multi(topic_str_partition_int_timestamp_int_dict_dict)
+        self.assertEqual(topic_str_partition_int_offset_int_dict_dict, {topic_str: cluster.offsets_for_times(topic_str, partition_int_timestamp_int_dict)[topic_str] for topic_str, partition_int_timestamp_int_dict in topic_str_partition_int_timestamp_int_dict_dict.items()})
+        self.assertEqual(topic_str_partition_int_offset_int_dict_dict[topic_str2][0], 0)
+        self.assertEqual(cluster.offsets_for_times_multi({}), {})
     
     def test_replicate_change_schema(self):
-        avro_schema_str = '{ "type": "record", "name": "myrecord", "fields": [{"name": "name",  "type": "string" }, {"name": "calories", "type": "float" }, {"name": "colour", "type": "string" }] }'
-        #
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="avro", target_value_schema=avro_schema_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="avro", target_value_schema=AVRO_SCHEMA_STR)
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
-        protobuf_schema_str = 'message Snack { required string name = 1; required float calories = 2; optional string colour = 3; }'
         cluster.create(f"{topic_str}_1")
-        (consumed_message_counter_int, produced_message_counter_int) = cluster.cp(topic_str, f"{topic_str}_1", source_value_type="avro", target_value_type="pb", target_value_schema=protobuf_schema_str, n=3)
+        (consumed_message_counter_int, produced_message_counter_int) = cluster.cp(topic_str, f"{topic_str}_1", source_value_type="avro", target_value_type="pb", target_value_schema=PB_SCHEMA_STR, n=3)
         self.assertEqual(consumed_message_counter_int, 3)
         self.assertEqual(produced_message_counter_int, 3)
         #
-        cluster.cp(f"{topic_str}_1", "./snacks_value1.txt", source_value_type="pb", n=3)
-        self.assertTrue(filecmp.cmp("./snacks_value.txt", "./snacks_value1.txt"))
-        os.remove("./snacks_value1.txt")
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
+        cluster.cp(f"{topic_str}_1", self.SNACKS_VALUE1_PATH, source_value_type="pb", n=3)
+        self.assertTrue(filecmp.cmp(self.SNACKS_VALUE_PATH, self.SNACKS_VALUE1_PATH))
+        os.remove(self.SNACKS_VALUE1_PATH)
 
     def test_flush_timeout_bug(self):
-        cluster = Cluster(cluster_str)
+        cluster = self.cluster
         #
         for i in range(3):
             print(i)
-            topic_str = create_test_topic_name()
-            cluster.create(topic_str)
+            topic_str = self.create_test_topic()
             cluster.create(f"{topic_str}_1")
             #
-            cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+            cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="str")
             self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
-            cluster.cp(topic_str, "./snacks_value1.txt", source_value_type="str", n=3)
-            cluster.cp("./snacks_value1.txt", f"{topic_str}_1", target_value_type="str")
+            cluster.cp(topic_str, self.SNACKS_VALUE1_PATH, source_value_type="str", n=3)
+            cluster.cp(self.SNACKS_VALUE1_PATH, f"{topic_str}_1", target_value_type="str")
             self.assertEqual(cluster.size(f"{topic_str}_1")[f"{topic_str}_1"][0], 3)
-            #
-            cluster.delete(topic_str)
-            cluster.delete(f"{topic_str}_1")
     
     def test_diff(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="json")
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="json")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         cluster.create(f"{topic_str}_1")
-        cluster.cp("./snacks_value.txt", f"{topic_str}_1", target_value_type="json")
+        cluster.cp(self.SNACKS_VALUE_PATH, f"{topic_str}_1", target_value_type="json")
         self.assertEqual(cluster.size(f"{topic_str}_1")[f"{topic_str}_1"][0], 3)
         #
         def map_function(message_dict):
@@ -751,7 +707,7 @@ class Test(unittest.TestCase):
             return value_dict1["colour"] == "white"
 
         #
-        cluster2 = Cluster(cluster_str)
+        cluster2 = Cluster(cluster_str, producer_config=test_producer_config_dict, consumer_config=test_consumer_config_dict)
         cluster.verbose(1)
         differing_message_dict_tuple_list, num_messages_int1, num_messages_int2 = diff(cluster, topic_str, cluster2, f"{topic_str}_1", break_function=break_function)
         self.assertEqual(differing_message_dict_tuple_list, [])
@@ -775,15 +731,10 @@ class Test(unittest.TestCase):
         self.assertEqual(num_messages_int1, 3)
         self.assertEqual(num_messages_int2, 3)
         self.assertEqual(acc[0][0]["name"], "cookie")
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
-        cluster.delete(f"{topic_str}_2")
 
     def test_upload_flatmap(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         #
         def flatmap_function(key_str_value_str_tuple):
             return [(key_str_value_str_tuple[0], key_str_value_str_tuple[1]), (key_str_value_str_tuple[0], key_str_value_str_tuple[1])]
@@ -792,37 +743,32 @@ class Test(unittest.TestCase):
             value_str = key_str_value_str_tuple[1]
             return "white" in value_str
         #
-        cluster.cp("./snacks_value.txt", topic_str, flatmap_function=flatmap_function, break_function=break_function, target_value_type="str")
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, flatmap_function=flatmap_function, break_function=break_function, target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 2)
-        #
-        cluster.delete(topic_str)
 
 
     def test_download_flatmap(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         #
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def flatmap_function(message_dict):
             return [message_dict, message_dict]
-        (message_counter_int, line_counter_int) = cluster.cp(topic_str, "./snacks_value1.txt", flatmap_function=flatmap_function, target_value_type="str")
+        (message_counter_int, line_counter_int) = cluster.cp(topic_str, self.SNACKS_VALUE1_PATH, flatmap_function=flatmap_function, target_value_type="str")
         self.assertEqual(message_counter_int, 3)
         self.assertEqual(line_counter_int, 6)
-        lines_count_int = count_lines("./snacks_value1.txt")
+        lines_count_int = count_lines(self.SNACKS_VALUE1_PATH)
         self.assertEqual(lines_count_int, 6)
         #
-        os.remove("./snacks_value1.txt")
-        cluster.delete(topic_str)
+        os.remove(self.SNACKS_VALUE1_PATH)
 
     def test_wc(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         #
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         (num_messages_int, num_words_int, num_bytes_int) = cluster.wc(topic_str)
@@ -830,25 +776,20 @@ class Test(unittest.TestCase):
         self.assertEqual(num_words_int, 18)
         self.assertEqual(num_bytes_int, 169)
         #
-        cluster.delete(topic_str)
-        #
         cluster.create(f"{topic_str}_1")
-        cluster.cp("./snacks_key_value.txt", f"{topic_str}_1", target_key_type="str", target_value_type="str", key_value_separator="/")
+        cluster.cp(self.SNACKS_KEY_VALUE_PATH, f"{topic_str}_1", target_key_type="str", target_value_type="str", key_value_separator="/")
         self.assertEqual(cluster.size(f"{topic_str}_1")[f"{topic_str}_1"][0], 3)
         #
         (num_messages_int, num_words_int, num_bytes_int) = cluster.wc(f"{topic_str}_1")
         self.assertEqual(num_messages_int, 3)
         self.assertEqual(num_words_int, 36)
         self.assertEqual(num_bytes_int, 368)
-        #
-        cluster.delete(f"{topic_str}_1")
 
     def test_map(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         #
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def map_function(message_dict):
@@ -867,15 +808,26 @@ class Test(unittest.TestCase):
         message_dict_list, num_messages_int = cluster.map(topic_str, map_function, break_function=break_function)
         self.assertEqual(json.loads(message_dict_list[0]["value"])["colour"], "brownish")
         self.assertEqual(num_messages_int, 2)
+
+    def test_foldl_break_offsets(self):
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.produce_list(topic_str, ["message 1", "message 2", "message 3"])
+        group_str = create_test_group_name()
         #
-        cluster.delete(topic_str)
+        # Only the offset of the message processed before the break may be committed, not the rest of the batch.
+        (message_str_list, _) = cluster.foldl(topic_str, lambda acc, message_dict: acc + [message_dict["value"]], [], break_function=lambda message_dict: message_dict["value"] == "message 2", group=group_str, batch_size=3)
+        self.assertEqual(message_str_list, ["message 1"])
+        self.assertEqual(cluster.group_offsets(group_str)[group_str][topic_str][0], 1)
+        #
+        (message_str_list, _) = cluster.foldl(topic_str, lambda acc, message_dict: acc + [message_dict["value"]], [], group=group_str, batch_size=3)
+        self.assertEqual(message_str_list, ["message 2", "message 3"])
 
     def test_filter(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         #
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="str")
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def filter_function(message_dict):
@@ -887,48 +839,42 @@ class Test(unittest.TestCase):
         (num_messages_int, produced_messages_counter_int) = filter(cluster, topic_str, cluster, f"{topic_str}_1", filter_function, source_value_type="json")
         self.assertEqual(num_messages_int, 3)
         self.assertEqual(produced_messages_counter_int, 1)
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
 
     def test_map_filter_to_from_file(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         #
-        cluster.map_from_file("./snacks_value.txt", topic_str, lambda x: x)
+        cluster.map_from_file(self.SNACKS_VALUE_PATH, topic_str, lambda x: x)
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         #
         def map_function(message_dict):
             message_dict["value"]["colour"] = "brown"
             return message_dict
-        (message_counter_int, line_counter_int) = cluster.map_to_file(topic_str, "./snacks_value1.txt", map_function=map_function, value_type="json")
+        (message_counter_int, line_counter_int) = cluster.map_to_file(topic_str, self.SNACKS_VALUE1_PATH, map_function=map_function, value_type="json")
         self.assertEqual(message_counter_int, 3)
         self.assertEqual(line_counter_int, 3)
         #
         def filter_function(key_str_value_str_tuple):
             _, value_str = key_str_value_str_tuple
             return json.loads(value_str)["name"] == "timtam"
-        (lines_counter_int, produced_messages_counter_int) = cluster.filter_from_file("./snacks_value1.txt", topic_str, filter_function)
+        (lines_counter_int, produced_messages_counter_int) = cluster.filter_from_file(self.SNACKS_VALUE1_PATH, topic_str, filter_function)
         self.assertEqual(lines_counter_int, 3)
         self.assertEqual(produced_messages_counter_int, 1)
         #
         def filter_function(message_dict):
             return message_dict["value"]["name"] == "timtam"
-        (message_counter_int, line_counter_int) = cluster.filter_to_file(topic_str, "./snacks_value2.txt", filter_function, value_type="json")
+        (message_counter_int, line_counter_int) = cluster.filter_to_file(topic_str, self.SNACKS_VALUE2_PATH, filter_function, value_type="json")
         self.assertEqual(message_counter_int, 4)
         self.assertEqual(line_counter_int, 2)
         #
-        os.remove("./snacks_value1.txt")
-        os.remove("./snacks_value2.txt")
-        cluster.delete(topic_str)
+        os.remove(self.SNACKS_VALUE1_PATH)
+        os.remove(self.SNACKS_VALUE2_PATH)
 
     def test_head_tail(self):
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
         #
-        cluster.cp("./snacks_value.txt", topic_str, flatmap_function=lambda x: [x, x, x, x], target_value_type="str")
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, flatmap_function=lambda x: [x, x, x, x], target_value_type="str")
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 12)
         #
         topic_str_message_dict_list_dict = cluster.head(topic_str)
@@ -940,19 +886,15 @@ class Test(unittest.TestCase):
         self.assertEqual(len(topic_str_message_dict_list_dict[topic_str]), 10)
         self.assertEqual(topic_str_message_dict_list_dict[topic_str][0]["offset"], 2)
         self.assertEqual(topic_str_message_dict_list_dict[topic_str][9]["offset"], 11)
-        #
-        cluster.delete(topic_str)
 
     def test_cp_no_target_schema(self):
-        schema_str = '{ "type": "record", "name": "myrecord", "fields": [{"name": "name",  "type": "string" }, {"name": "calories", "type": "float" }, {"name": "colour", "type": "string" }] }'
-        # Create topic with three Avro-encoded messages using the value schema schema_str.
-        cluster = Cluster(cluster_str)
-        topic_str = create_test_topic_name()
-        cluster.create(topic_str)
-        cluster.cp("./snacks_value.txt", topic_str, target_value_type="avro", target_value_schema=schema_str)
+        # Create topic with three Avro-encoded messages using the value schema AVRO_SCHEMA_STR.
+        cluster = self.cluster
+        topic_str = self.create_test_topic()
+        cluster.cp(self.SNACKS_VALUE_PATH, topic_str, target_value_type="avro", target_value_schema=AVRO_SCHEMA_STR)
         self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
         # Copy the topic to another topic *with* setting the target value schema explicitly.
-        cluster.cp(topic_str, f"{topic_str}_1", source_value_type="avro", target_value_type="avro", target_value_schema=schema_str)
+        cluster.cp(topic_str, f"{topic_str}_1", source_value_type="avro", target_value_type="avro", target_value_schema=AVRO_SCHEMA_STR)
 #        self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
 #        diff_tuple = cluster.diff(topic_str, f"{topic_str}_1")
 #        self.assertEqual(diff_tuple[0], [])
@@ -961,10 +903,87 @@ class Test(unittest.TestCase):
 #        self.assertEqual(cluster.size(topic_str)[topic_str][0], 3)
 #        diff_tuple = cluster.diff(topic_str, f"{topic_str}_2")
 #        self.assertEqual(diff_tuple[0], [])
-        #
-        cluster.delete(topic_str)
-        cluster.delete(f"{topic_str}_1")
-        cluster.delete(f"{topic_str}_2")
+
+
+# Tests which do not talk to the cluster (i.e. only check the error handling and the cluster configuration files) - without the shared cluster object, test files and topic cleanup of the other tests.
+class TestNoNetwork(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.old_home_str = os.environ.get("KASHPY_HOME")
+        os.environ["KASHPY_HOME"] = os.path.abspath("..")
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.old_home_str is None:
+            os.environ.pop("KASHPY_HOME", None)
+        else:
+            os.environ["KASHPY_HOME"] = cls.old_home_str
+
+    def setUp(self):
+        print("Test:", self._testMethodName)
+
+    def test_errors(self):
+        # Creating the cluster object does not wait for the cluster (the clients connect in the background), and neither of the following calls gets as far as talking to it.
+        cluster = Cluster(cluster_str)
+        self.assertIsNone(cluster.cp("./abc", "./abc"))
+        self.assertIsNone(cluster.consume("abc"))
+
+    def test_foldl_from_file_separator(self):
+        # Use a buffer size smaller than the messages so that the (multi-character) message separators and the multi-byte UTF-8 characters are split across reads.
+        message_str_list = ["cookie|crème", "cake", "timtam ünd"]
+        with tempfile.TemporaryDirectory() as tmp_dir_str:
+            path_str = os.path.join(tmp_dir_str, "snacks.txt")
+            with open(path_str, "w", encoding="utf-8") as textIOWrapper:
+                textIOWrapper.write("<->".join(message_str_list))
+            #
+            for bufsize_int in [2, 3, 5, 1024]:
+                (key_str_value_str_tuple_list, line_counter_int) = foldl_from_file(path_str, lambda acc, key_str_value_str_tuple: acc + [key_str_value_str_tuple], [], key_value_separator="|", message_separator="<->", bufsize=bufsize_int)
+                self.assertEqual(key_str_value_str_tuple_list, [("cookie", "crème"), (None, "cake"), (None, "timtam ünd")])
+                self.assertEqual(line_counter_int, 3)
+
+    def test_filter_str_list(self):
+        self.assertFalse(is_pattern("test"))
+        self.assertTrue(is_pattern("test*") and is_pattern("test?") and is_pattern("test[12]"))
+        #
+        str_list = ["test1", "test2", "bla1", "test"]
+        # Only literal names: looked up (in the order given, without duplicates), not matched.
+        self.assertEqual(filter_str_list(str_list, ["test", "bla1", "test", "missing"]), ["test", "bla1"])
+        # Patterns (and literal names alongside them): in the order of the collection.
+        self.assertEqual(filter_str_list(str_list, ["test?"]), ["test1", "test2"])
+        self.assertEqual(filter_str_list(str_list, ["bla1", "test[2]"]), ["test2", "bla1"])
+        self.assertEqual(filter_str_list(str_list, ["*"]), str_list)
+        self.assertEqual(filter_str_list(str_list, []), [])
+
+    def test_poll_backpressure(self):
+        # poll() must block (polling in short intervals) while the producer queue is above the high watermark, and then return.
+        cluster = Cluster(cluster_str)
+        cluster.producer_queue_high_watermark_int = 10
+        producer_mock = unittest.mock.MagicMock()
+        producer_mock.__len__.side_effect = [12, 10, 9]
+        cluster.producer = producer_mock
+        cluster.poll()
+        self.assertEqual(producer_mock.__len__.call_count, 3)
+        self.assertEqual(producer_mock.poll.call_args_list[:2], [unittest.mock.call(0.1), unittest.mock.call(0.1)])
+        #
+        # Even for the smallest producer queue, the high watermark must not be 0 (poll() would never return).
+        cluster = Cluster(cluster_str, producer_config={"queue.buffering.max.messages": 1})
+        self.assertEqual(cluster.producer_queue_high_watermark_int, 1)
+        producer_mock = unittest.mock.MagicMock()
+        producer_mock.__len__.return_value = 0
+        cluster.producer = producer_mock
+        cluster.poll()
+        self.assertNotIn(unittest.mock.call(0.1), producer_mock.poll.call_args_list)
+
+    def test_json_dumps(self):
+        # Load a second copy of the module with orjson blocked to compare json_dumps() with and without it (if orjson is not installed, both copies use the standard library).
+        moduleSpec = importlib.util.find_spec("kashpy.kash")
+        with unittest.mock.patch.dict(sys.modules, {"orjson": None}):
+            kash_without_orjson_module = importlib.util.module_from_spec(moduleSpec)
+            moduleSpec.loader.exec_module(kash_without_orjson_module)
+        #
+        for json_dumps_function in [json_dumps, kash_without_orjson_module.json_dumps]:
+            self.assertEqual(json_dumps_function({"name": "cookie", "calories": 500.0, "colour": "brown"}), '{"name":"cookie","calories":500.0,"colour":"brown"}')
+            self.assertEqual(json_dumps_function({1: "one"}), '{"1":"one"}')
 
     def test_clusters(self):
         cluster_str_list1 = clusters()